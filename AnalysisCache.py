@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+import TableCache
+from ComputeFirst import first_bitsets, named_first_sets
+from ComputeFollow import follow_bitsets, named_follow_sets
+from Grammar import Grammar
+from LL1Parser import LL1Table
+
+# Bump an algorithm's version whenever its results change; entries computed by an older version
+# are then no longer found and age out of the cache.
+ALGORITHM_VERSIONS = {'first': 1, 'follow': 1}
+
+# Entries of one kind kept on disk; the least recently used ones beyond this are deleted.
+MAX_ENTRIES = 64
+
+
+# Canonical hash of a grammar: its start symbol, its symbols in id order and its production
+# arrays. Symbol ids follow definition order, so any change to a production changes the hash,
+# while the same grammar written in another format (e.g. 'bXY' and ('b', 'X', 'Y')) keeps it.
+def grammar_key(grammar, start_symbol=None):
+    grammar = Grammar.of(grammar, start_symbol)
+    digest = hashlib.sha256()
+    digest.update(json.dumps([grammar.start_symbol, grammar.nonterminal_count, grammar.symbols],
+                             ensure_ascii=False).encode())
+    for column in (grammar.production_lhs, grammar.production_offsets, grammar.production_symbols):
+        digest.update(column.tobytes())
+    return digest.hexdigest()
+
+
+# FIRST and FOLLOW bitsets (see first_bitsets and follow_bitsets) of a grammar, read from the
+# cache when this grammar was analysed before by the same algorithm versions. An entry holds the
+# symbol names and one hex string per set.
+def analysis_bitsets(grammar, start_symbol=None, cache_dir=None, max_entries=MAX_ENTRIES):
+    grammar = Grammar.of(grammar, start_symbol)
+    key = TableCache.spec_hash(grammar_key(grammar), ALGORITHM_VERSIONS)
+    data = TableCache.load('analysis', key, cache_dir)
+    if data is not None and data.get('versions') == ALGORITHM_VERSIONS and data.get('symbols') == grammar.symbols:
+        return [int(bits, 16) for bits in data['first']], [int(bits, 16) for bits in data['follow']]
+
+    first = first_bitsets(grammar)
+    follow = follow_bitsets(grammar, first)
+    TableCache.store('analysis', key, {
+        'versions': ALGORITHM_VERSIONS,
+        'symbols': grammar.symbols,
+        'first': [format(bits, 'x') for bits in first],
+        'follow': [format(bits, 'x') for bits in follow],
+    }, cache_dir, max_entries)
+    return first, follow
+
+
+# compute_first and compute_follow results through the cache.
+def first_sets(grammar, cache_dir=None):
+    grammar = Grammar.of(grammar)
+    return named_first_sets(grammar, analysis_bitsets(grammar, cache_dir=cache_dir)[0])
+
+
+def follow_sets(grammar, start_symbol=None, cache_dir=None):
+    grammar = Grammar.of(grammar, start_symbol)
+    return named_follow_sets(grammar, analysis_bitsets(grammar, cache_dir=cache_dir)[1])
+
+
+# An LL1Table built from cached FIRST/FOLLOW sets.
+def ll1_table(grammar, start_symbol=None, cache_dir=None):
+    grammar = Grammar.of(grammar, start_symbol)
+    first, follow = analysis_bitsets(grammar, cache_dir=cache_dir)
+    return LL1Table(grammar, first=first, follow=follow)
+
+
+if __name__ == "__main__":
+    grammar = {
+        'S': ['bXY'],
+        'X': ['b', 'c'],
+        'Y': ['b', ''],
+    }
+    print('First sets:', first_sets(grammar))
+    print('Follow sets:', follow_sets(grammar))
+    print('LL(1) conflicts:', ll1_table(grammar).conflicts)
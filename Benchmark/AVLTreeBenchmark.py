@@ -0,0 +1,64 @@
+import gc
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Symoble-Table"))
+
+from TreeStructure import AVLTree, BinaryTree
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def insert_all(tree, keys):
+    for key in keys:
+        tree.insert(key, None)
+    return tree
+
+
+def search_all(tree, keys):
+    for key in keys:
+        tree.search(key)
+
+
+if __name__ == "__main__":
+    bulk_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    gc.disable()
+
+    # sorted identifiers, as generated code declares them
+    keys = [f"t{number:08d}" for number in range(900)]
+    _, elapsed = timed(insert_all, BinaryTree(), keys)
+    print(f"BinaryTree, 900 sorted inserts: {elapsed / len(keys) * 1e6:.0f} us per insert")
+    try:
+        insert_all(BinaryTree(), [f"t{number:08d}" for number in range(2000)])
+    except RecursionError:
+        print("BinaryTree, 2000 sorted inserts: RecursionError")
+
+    for count in (10_000, 100_000, 1_000_000):
+        keys = [f"t{number:08d}" for number in range(count)]
+        tree, insert_time = timed(insert_all, AVLTree(), keys)
+        probes = random.Random(0).sample(keys, min(count, 100_000))
+        _, search_time = timed(search_all, tree, probes)
+        print(f"AVLTree, {count:>9} sorted inserts: {insert_time / count * 1e6:5.2f} us per insert, "
+              f"{search_time / len(probes) * 1e6:5.2f} us per search, height {tree.height()} "
+              f"(log2 n = {math.log2(count):.1f})")
+        del tree
+
+    keys = range(bulk_size)
+    tree, build_time = timed(AVLTree.from_sorted, keys)
+    probes = random.Random(0).sample(keys, 100_000)
+    _, search_time = timed(search_all, tree, probes)
+    print(f"AVLTree.from_sorted, {bulk_size} keys: {build_time:.1f} s, "
+          f"{search_time / len(probes) * 1e6:5.2f} us per search, height {tree.height()} "
+          f"(AVL bound {1.44 * math.log2(bulk_size + 2):.1f})")
+    for key in probes[:10_000]:
+        tree.delete(key)
+        tree.insert(key, key)
+    print(f"  after 10000 deletes and reinserts: height {tree.height()}, "
+          f"range [5000000, 5000005): {[key for key, _ in tree.items(5_000_000, 5_000_005)]}")
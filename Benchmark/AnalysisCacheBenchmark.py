@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AnalysisCache
+from ComputeFirst import compute_first
+from ComputeFollow import compute_follow
+from Grammar import Grammar
+
+from FirstSetBenchmark import WIDE_TERMINALS
+from LALRBenchmark import generate_grammar
+
+
+def timed(function, *arguments, **keywords):
+    start = time.perf_counter()
+    result = function(*arguments, **keywords)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    cache_dir = tempfile.mkdtemp()
+    rules, start_symbol = generate_grammar(3000, 3, 0, WIDE_TERMINALS)
+    grammar = Grammar(rules, start_symbol)
+    print(f"{grammar.production_count} productions")
+
+    (first, follow), analysis_time = timed(lambda: (compute_first(grammar), compute_follow(grammar)))
+    _, cold_time = timed(AnalysisCache.analysis_bitsets, grammar, cache_dir=cache_dir)
+    _, warm_time = timed(AnalysisCache.analysis_bitsets, grammar, cache_dir=cache_dir)
+    if (AnalysisCache.first_sets(grammar, cache_dir) != first
+            or AnalysisCache.follow_sets(grammar, cache_dir=cache_dir) != follow):
+        raise SystemExit("Cached sets differ from a fresh analysis")
+    print(f"  analysis {analysis_time * 1000:.1f} ms, cold cache {cold_time * 1000:.1f} ms, "
+          f"warm cache {warm_time * 1000:.1f} ms")
+
+    # changing one production must miss the cache
+    nonterminal = next(iter(rules))
+    rules[nonterminal] = rules[nonterminal] + ['a']
+    changed = Grammar(rules, start_symbol)
+    _, changed_time = timed(AnalysisCache.analysis_bitsets, changed, cache_dir=cache_dir)
+    if AnalysisCache.follow_sets(changed, cache_dir=cache_dir) != compute_follow(changed):
+        raise SystemExit("A changed grammar was served stale sets")
+    print(f"  after adding one production: {changed_time * 1000:.1f} ms (recomputed)")
+
+    lru_dir = tempfile.mkdtemp()
+    for seed in range(6):
+        AnalysisCache.analysis_bitsets(generate_grammar(20, 3, seed)[0], cache_dir=lru_dir, max_entries=4)
+    print(f"  6 grammars with max_entries=4: {len(os.listdir(lru_dir))} entries on disk")
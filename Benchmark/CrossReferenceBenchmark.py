@@ -0,0 +1,75 @@
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Symoble-Table"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CrossReference import CrossReference
+from Interner import Interner
+from OrderedTable import OrderedTable
+from ProgramParser import ProgramParser
+from TokenStream import TokenStream
+
+
+# line_count assignments over variable_count variables, each reading up to two others.
+def generate_program(file_path, line_count, variable_count, seed=0):
+    rng = random.Random(seed)
+    with open(file_path, 'w') as file:
+        for number in range(line_count):
+            target = f"v{number % variable_count}"  # every variable is defined before it is read
+            operands = [f"v{rng.randrange(min(number, variable_count))}" if number else "1"
+                        for _ in range(rng.randrange(1, 3))]
+            file.write(f"{target} = {' + '.join(operands)}\n")
+
+
+def declared(file_path):
+    table = OrderedTable()
+    ProgramParser(TokenStream.from_file(file_path), table).parse()
+    return table
+
+
+# The report's "Line Repeat" column the old way: every line rescanned for every variable.
+def rescan_report(file_path, table):
+    with open(file_path, 'r') as file:
+        file_content = [line.strip() for line in file]
+    return [[i + 1 for i, line in enumerate(file_content)
+             if i + 1 != line_declare and line.strip().startswith(variable_name + " = ")]
+            for variable_name, _, line_declare in table.sorted_table()]
+
+
+def index_report(cross_reference, table):
+    return [cross_reference.lines_of(variable_name, except_line=line_declare)
+            for variable_name, _, line_declare in table.sorted_table()]
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    gc.disable()
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "program.txt")
+        for line_count, variable_count in ((5_000, 1_000), (10_000, 2_000), (200_000, 50_000)):
+            generate_program(file_path, line_count, variable_count)
+            stream, lex_time = timed(TokenStream.from_file, file_path)
+            cross_reference = CrossReference(Interner())
+            _, feed_time = timed(cross_reference.feed_stream, stream)
+            table = declared(file_path)
+            _, index_time = timed(index_report, cross_reference, table)
+            print(f"{line_count} lines, {variable_count} variables: lexing {lex_time * 1000:.0f} ms, "
+                  f"filling the index {feed_time * 1000:.0f} ms; report from the index "
+                  f"{index_time * 1000:.1f} ms", end="")
+            if line_count * variable_count <= 2 * 10 ** 7:
+                _, rescan_time = timed(rescan_report, file_path, table)
+                print(f", by rescanning {rescan_time * 1000:.0f} ms")
+            else:
+                print()
+            uses = sum(kinds.count(2) for kinds in cross_reference.kinds)
+            print(f"  {uses} uses indexed; the rescan sees only assignments at line start")
@@ -0,0 +1,62 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ParseTree
+from ExpressionEngine import ExpressionEngine
+from TokenStream import TokenStream
+
+
+def tokens_of(text):
+    return [tuple(token) for token in TokenStream.from_text(text, ParseTree.TOKEN_TYPES)]
+
+
+def random_expression(rng, depth=0):
+    if depth > 6 or rng.random() < 0.3:
+        return rng.choice(["1", "x", "2.5", '"s"'])
+    if rng.random() < 0.3:
+        return f"({random_expression(rng, depth + 1)})"
+    return f"{random_expression(rng, depth + 1)} {rng.choice('+-*/')} {random_expression(rng, depth + 1)}"
+
+
+def recursive_parse(tokens):
+    return ParseTree.Parser(tokens).expression()
+
+
+def engine_parse(tokens, engine=ExpressionEngine()):
+    return engine.parse(tokens)[0]
+
+
+def time_parse(function, inputs):
+    start = time.perf_counter()
+    trees = [function(tokens) for tokens in inputs]
+    return trees, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    inputs = [tokens_of(random_expression(rng)) for _ in range(20000)]
+    node_count = sum(len(tokens) for tokens in inputs)
+    recursive_trees, recursive_time = time_parse(recursive_parse, inputs)
+    engine_trees, engine_time = time_parse(engine_parse, inputs)
+    if recursive_trees != engine_trees:
+        raise SystemExit("Trees differ")
+    print(f"Random expressions ({node_count} tokens)")
+    print(f"  ParseTree.Parser : {recursive_time:.2f}s  ({recursive_time / node_count * 1e9:.0f} ns/token)")
+    print(f"  ExpressionEngine : {engine_time:.2f}s  ({engine_time / node_count * 1e9:.0f} ns/token)")
+    print("  (about the same cost per token: the engine removes the recursion limit, it is not a speedup)")
+
+    print("Nested parentheses")
+    for depth in (100, 1000, 10_000, 100_000):
+        tokens = tokens_of("(" * depth + "1 + x" + ")" * depth)
+        for name, function in (("ParseTree.Parser", recursive_parse), ("ExpressionEngine", engine_parse)):
+            start = time.perf_counter()
+            try:
+                function(tokens)
+                result = f"{(time.perf_counter() - start) * 1000:.1f} ms"
+            except RecursionError:
+                result = "RecursionError"
+            print(f"  depth {depth:>7}  {name}: {result}")
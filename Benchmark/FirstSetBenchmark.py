@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ComputeFirst import compute_first
+
+from LALRBenchmark import generate_grammar
+
+WIDE_TERMINALS = ''.join(chr(0x4E00 + number) for number in range(400))
+
+
+# Textbook FIRST computation, as compute_first did it before: rescan every production until a
+# whole pass adds nothing.
+def fixpoint_first(grammar):
+    first_sets = {symbol: set() for symbol in grammar}
+    updated = True
+    while updated:
+        updated = False
+        for symbol, productions in grammar.items():
+            for production in productions:
+                before = len(first_sets[symbol])
+                for part in production:
+                    if part not in grammar:
+                        first_sets[symbol].add(part)
+                        break
+                    first_sets[symbol].update(first_sets[part] - {''})
+                    if '' not in first_sets[part]:
+                        break
+                else:
+                    first_sets[symbol].add('')
+                if len(first_sets[symbol]) != before:
+                    updated = True
+    return first_sets
+
+
+def timed(function, grammar):
+    start = time.perf_counter()
+    result = function(grammar)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rng = random.Random(1)
+    for seed in range(500):
+        grammar, _ = generate_grammar(rng.randint(1, 40), rng.randint(1, 5), seed, rng.choice(['ab', 'abcdefgh']))
+        if compute_first(grammar) != fixpoint_first(grammar):
+            raise SystemExit(f"FIRST sets differ for seed {seed}")
+    print("500 random grammars: same FIRST sets as the fixpoint")
+
+    for nonterminal_count in (300, 1000, 3000):
+        grammar, _ = generate_grammar(nonterminal_count, 3, 0, WIDE_TERMINALS)
+        production_count = sum(len(productions) for productions in grammar.values())
+        reference, reference_time = timed(fixpoint_first, grammar)
+        result, result_time = timed(compute_first, grammar)
+        if result != reference:
+            raise SystemExit("FIRST sets differ")
+        print(f"{production_count} productions: fixpoint {reference_time:.3f}s, "
+              f"digraph/bitset {result_time:.3f}s ({reference_time / result_time:.1f}x)")
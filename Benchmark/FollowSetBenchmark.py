@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ComputeFirst import compute_first
+from ComputeFollow import compute_follow
+
+from FirstSetBenchmark import WIDE_TERMINALS
+from LALRBenchmark import generate_grammar
+
+
+# FOLLOW computation as compute_follow did it before: rescan every production until a whole
+# pass adds nothing.
+def fixpoint_follow(grammar, start_symbol, first_sets):
+    follow_sets = {symbol: set() for symbol in grammar}
+    follow_sets[start_symbol].add('$')
+    updated = True
+    while updated:
+        updated = False
+        for symbol in grammar:
+            for production in grammar[symbol]:
+                for i, part in enumerate(production):
+                    if part not in grammar:
+                        continue
+                    before = len(follow_sets[part])
+                    j = i + 1
+                    while j < len(production):
+                        next_first = first_sets[production[j]] if production[j] in grammar else {production[j]}
+                        follow_sets[part].update(next_first - {''})
+                        if '' not in next_first:
+                            break
+                        j += 1
+                    if j == len(production):
+                        follow_sets[part].update(follow_sets[symbol])
+                    if len(follow_sets[part]) != before:
+                        updated = True
+    return follow_sets
+
+
+if __name__ == "__main__":
+    rng = random.Random(2)
+    for seed in range(500):
+        grammar, start_symbol = generate_grammar(rng.randint(1, 40), rng.randint(1, 5), seed,
+                                                 rng.choice(['ab', 'abcdefgh']))
+        first_sets = compute_first(grammar)
+        if compute_follow(grammar, start_symbol) != fixpoint_follow(grammar, start_symbol, first_sets):
+            raise SystemExit(f"FOLLOW sets differ for seed {seed}")
+    print("500 random grammars: same FOLLOW sets as the fixpoint")
+
+    for nonterminal_count in (300, 1000, 3000):
+        grammar, start_symbol = generate_grammar(nonterminal_count, 3, 0, WIDE_TERMINALS)
+        production_count = sum(len(productions) for productions in grammar.values())
+        first_sets = compute_first(grammar)
+        start = time.perf_counter()
+        reference = fixpoint_follow(grammar, start_symbol, first_sets)
+        reference_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = compute_follow(grammar, start_symbol)
+        result_time = time.perf_counter() - start
+        if result != reference:
+            raise SystemExit("FOLLOW sets differ")
+        print(f"{production_count} productions: fixpoint {reference_time:.3f}s, "
+              f"digraph {result_time:.3f}s including FIRST ({reference_time / result_time:.1f}x)")
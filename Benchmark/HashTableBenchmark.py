@@ -0,0 +1,55 @@
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Symoble-Table"))
+
+from HashingTable import HashTable
+
+
+# count distinct identifiers in the style of generated code: a short prefix and a number.
+def generate_identifiers(count, seed=0):
+    rng = random.Random(seed)
+    prefixes = ["tmp", "var", "node", "x", "label", "field", "arg", "result"]
+    identifiers = [f"{rng.choice(prefixes)}_{number}" for number in range(count)]
+    rng.shuffle(identifiers)
+    return identifiers
+
+
+# Longest chain the old len(word) * ord(word[0]) hash would build over the same buckets.
+def old_hash_longest_chain(identifiers, buckets):
+    chains = {}
+    for word in identifiers:
+        index = len(word) * ord(word[0]) % buckets
+        chains[index] = chains.get(index, 0) + 1
+    return max(chains.values())
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    gc.disable()  # as timeit does: the cyclic collector's passes grow with the live node count
+    for count in sizes:
+        identifiers = generate_identifiers(count)
+        table = HashTable()
+        start = time.perf_counter()
+        for word in identifiers:
+            table.insert(word, len(word))
+        insert_time = time.perf_counter() - start
+
+        probes = identifiers[:]
+        random.Random(1).shuffle(probes)
+        start = time.perf_counter()
+        for word in probes:
+            table.lookup(word)
+        lookup_time = time.perf_counter() - start
+        if len(table) != count or any(table.lookup(word) != len(word) for word in identifiers[:1000]):
+            raise SystemExit("HashTable lost identifiers")
+
+        stats = table.stats()
+        print(f"{count:>9} identifiers: insert {insert_time / count * 1e9:6.0f} ns, "
+              f"lookup {lookup_time / count * 1e9:6.0f} ns per identifier; "
+              f"{stats['buckets']} buckets, longest chain {stats['longest_chain']}, "
+              f"average {stats['average_chain']:.2f} "
+              f"(old hash: longest chain {old_hash_longest_chain(identifiers, stats['buckets'])})")
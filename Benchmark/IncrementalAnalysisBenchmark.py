@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ComputeFirst import compute_first
+from ComputeFollow import compute_follow
+from IncrementalAnalysis import IncrementalAnalysis
+
+from FirstSetBenchmark import WIDE_TERMINALS
+from LALRBenchmark import generate_grammar
+
+
+# A random edit: remove one of the productions, or add a short new one.
+def random_edit(rng, analysis, nonterminals, terminals):
+    nonterminal = rng.choice(nonterminals)
+    if analysis.productions[nonterminal] and rng.random() < 0.5:
+        return 'remove', nonterminal, rng.choice(analysis.productions[nonterminal])
+    while True:
+        production = tuple(rng.choice(nonterminals) if rng.random() < 0.4 else rng.choice(terminals)
+                           for _ in range(rng.randint(0, 4)))
+        if production not in analysis.productions[nonterminal]:
+            return 'add', nonterminal, production
+
+
+def apply(analysis, edit):
+    kind, nonterminal, production = edit
+    if kind == 'add':
+        return analysis.add_production(nonterminal, production)
+    return analysis.remove_production(nonterminal, production)
+
+
+if __name__ == "__main__":
+    rng = random.Random(3)
+    for seed in range(100):
+        grammar, start_symbol = generate_grammar(rng.randint(2, 25), rng.randint(1, 4), seed, 'abcd')
+        analysis = IncrementalAnalysis(grammar, start_symbol)
+        for _ in range(30):
+            apply(analysis, random_edit(rng, analysis, list(grammar), 'abcd'))
+            rules = analysis.rules()
+            if (analysis.first_sets() != compute_first(rules)
+                    or analysis.follow_sets() != compute_follow(rules, start_symbol)):
+                raise SystemExit(f"Sets differ from a full recompute for seed {seed}")
+    print("100 random grammars x 30 edits: same sets as a full recompute")
+
+    for nonterminal_count in (300, 1000, 3000):
+        grammar, start_symbol = generate_grammar(nonterminal_count, 3, 0, WIDE_TERMINALS)
+        production_count = sum(len(productions) for productions in grammar.values())
+        analysis = IncrementalAnalysis(grammar, start_symbol)
+        edits = [random_edit(rng, analysis, list(grammar), WIDE_TERMINALS) for _ in range(50)]
+        edits = list(dict.fromkeys(edits))
+
+        start = time.perf_counter()
+        for edit in edits:
+            apply(analysis, edit)
+        incremental_time = (time.perf_counter() - start) / len(edits)
+
+        rules = analysis.rules()
+        start = time.perf_counter()
+        compute_follow(rules, start_symbol, compute_first(rules))
+        full_time = time.perf_counter() - start
+        print(f"{production_count} productions: full FIRST+FOLLOW {full_time * 1000:.1f} ms, "
+              f"incremental {incremental_time * 1000:.2f} ms per edit")
@@ -0,0 +1,89 @@
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "Symoble-Table"))
+sys.path.insert(0, root)
+
+from HashingTable import HashTable
+from Interner import Interner
+from TokenStream import TokenStream
+from TokensAndLexem import tokenize_line
+
+
+# Assignments over name_count distinct identifiers, occurrences identifiers in all.
+def generate_corpus(occurrences, name_count, seed=0):
+    rng = random.Random(seed)
+    names = [f"{rng.choice(['total', 'value', 'index', 'node', 'tmp'])}_{number}" for number in range(name_count)]
+    lines = []
+    for _ in range(occurrences // 4):
+        a, b, c, d = (rng.choice(names) for _ in range(4))
+        lines.append(f"{a} = {b} + {c} * ({d} - 1)")
+    return "\n".join(lines) + "\n"
+
+
+# Result of function() and the bytes allocated for it that are still alive.
+def allocated_by(function):
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+# Declares every identifier occurrence not yet in the table and looks up the others, as the
+# parsers do per assignment.
+def fill(table, keys):
+    for key in keys:
+        if table.lookup(key) is None:
+            table.insert(key, 1)
+    return table
+
+
+if __name__ == "__main__":
+    occurrences = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    text = generate_corpus(occurrences, 50_000)
+    lines = text.splitlines()
+    print(f"{occurrences} identifier occurrences of 50000 names, {len(text) / 2 ** 20:.1f} MiB")
+
+    tokens, plain_size = allocated_by(lambda: [tokenize_line(line, number) for number, line in enumerate(lines, 1)])
+    identifiers = [token[1] for line_tokens in tokens for token in line_tokens if token[0] == 'IDENTIFIER']
+    del tokens
+    interner = Interner()
+    tokens, interned_size = allocated_by(
+        lambda: [tokenize_line(line, number, interner) for number, line in enumerate(lines, 1)])
+    del tokens
+    print(f"  token tuples: {plain_size / 2 ** 20:6.1f} MiB, interned, with ids {interned_size / 2 ** 20:6.1f} MiB")
+
+    stream, stream_time = timed(lambda: TokenStream.from_text(text))
+    interner = Interner()
+    interned_stream, interned_stream_time = timed(lambda: TokenStream.from_text(text, interner=interner))
+    symbols = [symbol for symbol in interned_stream.symbols if symbol >= 0]
+    print(f"  TokenStream: {stream_time * 1000:.0f} ms, {interned_stream_time * 1000:.0f} ms with the symbols "
+          f"column (+{len(interned_stream.symbols) * 4 / 2 ** 20:.1f} MiB, {len(interner)} ids)")
+    if [interner.name(symbol) for symbol in symbols[:1000]] != identifiers[:1000]:
+        raise SystemExit("Interned ids do not match the lexemes")
+    del stream, interned_stream
+
+    gc.disable()
+    for label, make in (("dict", dict), ("HashTable", HashTable)):
+        if label == "dict":
+            table_fill = lambda table, keys: [table.setdefault(key, 1) for key in keys]
+        else:
+            table_fill = fill
+        _, string_time = timed(lambda: table_fill(make(), identifiers))
+        _, id_time = timed(lambda: table_fill(make(), symbols))
+        print(f"  {label:>9} keyed by lexeme {string_time / len(symbols) * 1e9:5.0f} ns, "
+              f"by id {id_time / len(symbols) * 1e9:5.0f} ns per occurrence")
+    gc.enable()
@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import LALRParser
+
+TERMINALS = 'abcdefghijklmnopqrstuvwxyz+*()'
+
+
+# Random grammar in the compute_first format. Symbols are one character each, so the
+# nonterminals are taken from U+0400 onwards. Every nonterminal's first production mentions the
+# next one, which keeps all of them reachable from the start symbol. A larger terminals string
+# gives wider FIRST and FOLLOW sets.
+def generate_grammar(nonterminal_count, productions_per_nonterminal=3, seed=0, terminals=TERMINALS):
+    rng = random.Random(seed)
+    nonterminals = [chr(0x400 + number) for number in range(nonterminal_count)]
+    grammar = {}
+    for number, nonterminal in enumerate(nonterminals):
+        productions = []
+        for production_number in range(productions_per_nonterminal):
+            length = rng.randint(1, 3) if production_number == 0 else rng.randint(0, 4)
+            symbols = [rng.choice(nonterminals) if rng.random() < 0.4 else rng.choice(terminals)
+                       for _ in range(length)]
+            if production_number == 0 and number + 1 < nonterminal_count:
+                symbols.insert(rng.randint(0, len(symbols)), nonterminals[number + 1])
+            productions.append(''.join(symbols))
+        grammar[nonterminal] = list(dict.fromkeys(productions))
+    return grammar, nonterminals[0]
+
+
+if __name__ == "__main__":
+    cache_dir = tempfile.mkdtemp()
+    for nonterminal_count in (20, 50, 100):
+        grammar, start_symbol = generate_grammar(nonterminal_count)
+        production_count = sum(len(productions) for productions in grammar.values())
+
+        start = time.perf_counter()
+        tables = LALRParser.build_tables(grammar, start_symbol)
+        build_time = time.perf_counter() - start
+        LALRParser.load_parser(grammar, start_symbol, cache_dir)  # fills the cache
+        start = time.perf_counter()
+        LALRParser.load_parser(grammar, start_symbol, cache_dir)
+        load_time = time.perf_counter() - start
+
+        rows = len(tables['action_default']) * (len(tables['symbols']) - tables['nonterminal_count'])
+        print(f"{production_count} productions, {len(tables['action_default'])} states, "
+              f"{len(tables['conflicts'])} conflicts")
+        print(f"  build {build_time:.2f}s, cached load {load_time * 1000:.1f} ms")
+        print(f"  action table {len(tables['action_check'])} slots packed from {rows}")
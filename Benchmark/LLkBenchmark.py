@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Grammar import Grammar
+from LLkAnalysis import LLkAnalysis
+
+from LALRBenchmark import generate_grammar
+
+# A small statement language, written right-recursive for LL parsing. Assignments, calls and
+# indexed assignments all start with IDENTIFIER and only part ways after one to three tokens.
+LANGUAGE = Grammar.from_text("""
+    Program    -> Statement Program |
+    Statement  -> IDENTIFIER '=' Expr ';'
+                | IDENTIFIER '(' Arguments ')' ';'
+                | IDENTIFIER '[' Expr ']' '=' Expr ';'
+                | 'if' '(' Expr ')' Block Else
+                | 'while' '(' Expr ')' Block
+                | 'return' Expr ';'
+                | Block
+    Block      -> '{' Program '}'
+    Else       -> 'else' Block |
+    Arguments  -> Expr MoreArgs |
+    MoreArgs   -> ',' Expr MoreArgs |
+    Expr       -> Compare Logic
+    Logic      -> '&&' Compare Logic | '||' Compare Logic |
+    Compare    -> Sum CompareTail
+    CompareTail -> '<' Sum | '>' Sum | '==' Sum |
+    Sum        -> Product SumTail
+    SumTail    -> '+' Product SumTail | '-' Product SumTail |
+    Product    -> Unary ProductTail
+    ProductTail -> '*' Unary ProductTail | '/' Unary ProductTail |
+    Unary      -> '-' Unary | '!' Unary | Primary
+    Primary    -> NUMBER | STRING | IDENTIFIER | IDENTIFIER '(' Arguments ')'
+                | IDENTIFIER '[' Expr ']' | '(' Expr ')'
+""")
+
+
+def analyse(grammar, k, max_lookaheads=2_000_000):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        analysis = LLkAnalysis(grammar, k, max_lookaheads=max_lookaheads)
+        conflicts = len(analysis.conflicts())
+    except ValueError as error:
+        tracemalloc.stop()
+        return f"{(time.perf_counter() - start) * 1000:8.1f} ms  stopped: {error}"
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (f"{elapsed * 1000:8.1f} ms  {len(analysis.strings):>6} distinct lookaheads in {len(analysis.sets):>5} sets "
+            f"({analysis.stored} entries)  peak {peak / 2 ** 20:5.1f} MiB  {conflicts} conflicting pairs")
+
+
+if __name__ == "__main__":
+    generated, _ = generate_grammar(30, 3, 0, 'abcdef')
+    for name, grammar in (("statement language", LANGUAGE), ("generated, 30 nonterminals", generated)):
+        grammar = Grammar.of(grammar)
+        print(f"{name} ({grammar.production_count} productions)")
+        for k in (1, 2, 3, 4):
+            print(f"  k={k}: {analyse(grammar, k)}")
+    print("generated grammar, k=4, capped at 100000 stored lookaheads:")
+    print(f"  {analyse(generated, 4, max_lookaheads=100_000)}")
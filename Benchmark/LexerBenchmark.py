@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TokensAndLexem import TOKEN_REGEXES, lexer
+
+# The lexer as it was before the master regex: try every regex at every position
+# and cut the matched text off the front of the line.
+def lexer_per_regex(file_path):
+    tokens = []
+    with open(file_path, 'r') as file:
+        for line_number, line in enumerate(file, 1):
+            line_tokens = []
+            line = line.strip()
+            while line:
+                match = None
+                for token_name, token_regex in TOKEN_REGEXES:
+                    regex_match = token_regex.match(line)
+                    if regex_match:
+                        match = (token_name, regex_match.group(0))
+                        if token_name != "WHITESPACE":
+                            line_tokens.append((match[0], match[1], f"Line : {line_number}"))
+                        line = line[regex_match.end():]
+                        break
+                if not match:
+                    raise ValueError(f'Invalid token at line {line_number}: {line}')
+            tokens.append(line_tokens)
+    return tokens
+
+
+# Writes a file of random assignments, with some very long lines mixed in.
+def generate_source(file_path, size_mb, seed=0):
+    rng = random.Random(seed)
+    names = ["x", "y", "total", "value_1", "_tmp", "counter"]
+    atoms = names + ["1", "42", "3.14", '"text"', '"a b"']
+    operators = [" + ", " - ", " * ", " / "]
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(file_path, 'w') as file:
+        while written < target:
+            length = rng.choice([3, 5, 9, 400])  # a few long lines show the quadratic slicing
+            parts = [rng.choice(atoms)]
+            for _ in range(length):
+                parts.append(rng.choice(operators))
+                parts.append(rng.choice(atoms))
+            line = f"{rng.choice(names)} = ({''.join(parts)}) $\n"
+            file.write(line)
+            written += len(line)
+
+
+def measure(function, file_path):
+    start = time.perf_counter()
+    result = function(file_path)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "source.txt")
+        generate_source(file_path, size_mb)
+        old_tokens, old_time = measure(lexer_per_regex, file_path)
+        new_tokens, new_time = measure(lexer, file_path)
+
+    if old_tokens != new_tokens:
+        raise SystemExit("Token streams differ")
+
+    count = sum(len(line_tokens) for line_tokens in new_tokens)
+    print(f"Input          : {size_mb} MB, {count} tokens")
+    print(f"Per-regex lexer: {old_time:.2f}s  ({size_mb / old_time:.2f} MB/s)")
+    print(f"Master regex   : {new_time:.2f}s  ({size_mb / new_time:.2f} MB/s)")
+    print(f"Speedup        : {old_time / new_time:.1f}x")
@@ -0,0 +1,50 @@
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Symoble-Table"))
+
+from HashingTable import TABLE_TYPES, create_table
+
+from HashTableBenchmark import generate_identifiers
+
+
+# The table of the given kind holding identifiers, and the bytes it allocated (the identifier
+# strings themselves exist beforehand and are not counted).
+def build(kind, identifiers):
+    gc.collect()
+    tracemalloc.start()
+    table = create_table(kind)
+    for word in identifiers:
+        table.insert(word, None)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return table, size
+
+
+def lookup_time(table, probes):
+    start = time.perf_counter()
+    for word in probes:
+        table.lookup(word)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [100_000, 1_000_000]
+    gc.disable()
+    for count in sizes:
+        identifiers = generate_identifiers(count)
+        hits = identifiers[:]
+        random.Random(1).shuffle(hits)
+        misses = [word + "_" for word in hits]
+        print(f"{count} identifiers")
+        for kind in TABLE_TYPES:
+            table, size = build(kind, identifiers)
+            hit_time = lookup_time(table, hits)
+            miss_time = lookup_time(table, misses)
+            print(f"  {kind:>15}: {size / count:6.1f} bytes per entry, lookup hit {hit_time / count * 1e9:5.0f} ns, "
+                  f"miss {miss_time / count * 1e9:5.0f} ns, load factor {table.stats()['load_factor']:.2f}")
+            del table
@@ -0,0 +1,68 @@
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Symoble-Table"))
+
+from OrderedTable import OrderedTable
+
+from HashTableBenchmark import generate_identifiers
+
+
+# The list-backed table OrderedTable replaced: a scan per lookup and a full sort per report.
+class ListTable:
+    def __init__(self):
+        self.table = []
+
+    def insert(self, name, datatype, line_declare):
+        self.table.append((name, datatype, line_declare))
+
+    def lookup(self, name):
+        for i in self.table:
+            if i[0] == name:
+                return i[1]
+        return None
+
+    def sorted_table(self):
+        return sorted(self.table, key=lambda x: x[0])
+
+
+# What Parser does per assignment: look the name up and declare it when it is new.
+def declare_all(table, names):
+    for line, name in enumerate(names, 1):
+        if not table.lookup(name):
+            table.insert(name, "int", line)
+    return table
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    gc.disable()
+    for count in (1_000, 5_000):
+        names = generate_identifiers(count)
+        _, elapsed = timed(declare_all, ListTable(), names)
+        print(f"list table, {count:>9} symbols: {elapsed / count * 1e6:8.2f} us per declaration")
+
+    for count in (10_000, 100_000, 1_000_000):
+        names = generate_identifiers(count)
+        table, declare_time = timed(declare_all, OrderedTable(), names)
+        probes = random.Random(1).sample(names, min(count, 100_000))
+        _, lookup_time = timed(lambda: [table.lookup(name) for name in probes])
+        _, sorted_time = timed(table.sorted_table)
+        snapshot, snapshot_time = timed(table.snapshot)
+        _, first_time = timed(lambda: [entry for _, entry in zip(range(20), table.sorted_entries("tmp_5"))])
+        _, after_snapshot_time = timed(declare_all, table, [name + "_new" for name in probes[:1000]])
+        if len(snapshot) != count or [entry[0] for entry in snapshot] != sorted(names):
+            raise SystemExit("Snapshot changed after inserts")
+        print(f"OrderedTable, {count:>9} symbols: {declare_time / count * 1e6:5.2f} us per declaration, "
+              f"{lookup_time / len(probes) * 1e9:4.0f} ns per lookup, sorted_table {sorted_time * 1000:6.1f} ms, "
+              f"snapshot {snapshot_time * 1e6:4.1f} us, first 20 names from 'tmp_5' {first_time * 1e6:5.1f} us, "
+              f"1000 declarations after a snapshot {after_snapshot_time * 1000:5.1f} ms")
+        del table, snapshot
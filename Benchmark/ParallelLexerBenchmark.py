@@ -0,0 +1,27 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ParallelLexer import lex_file_parallel
+
+from LexerBenchmark import generate_source
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, 16, cpus} & set(range(1, cpus + 1)))
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "source.txt")
+        generate_source(file_path, size_mb)
+        print(f"Input: {size_mb} MB, {cpus} CPUs")
+        base_time = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            with lex_file_parallel(file_path, workers=workers) as stream:
+                elapsed = time.perf_counter() - start
+                base_time = base_time or elapsed
+                print(f"{workers:>3} workers: {elapsed:6.2f}s  {len(stream)} tokens  speedup {base_time / elapsed:.1f}x")
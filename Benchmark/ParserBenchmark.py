@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ParseTree
+from ProgramParser import ProgramParser
+from TokenStream import TokenStream
+
+
+# One assignment per line, the only layout the per-line Parser understands.
+def generate_program(line_count, seed=0):
+    rng = random.Random(seed)
+    names = ["x", "y", "total", "value_1", "counter"]
+    atoms = names + ["1", "42", "3.14", '"text"']
+    lines = []
+    for _ in range(line_count):
+        parts = [rng.choice(atoms)]
+        for _ in range(rng.randint(0, 6)):
+            parts.append(rng.choice(" + - * / ".split()))
+            parts.append(rng.choice(atoms))
+        expression = " ".join(parts)
+        if rng.random() < 0.3:
+            expression = f"({expression}) * {rng.choice(atoms)}"
+        lines.append(f"{rng.choice(names)} = {expression}")
+    return "\n".join(lines) + "\n"
+
+
+# What ParseTree.py and the symbol-table scripts used to do: a new Parser for every line.
+def parse_per_line(tokens_per_line):
+    return [ParseTree.Parser(line_tokens).parse() for line_tokens in tokens_per_line]
+
+
+def parse_program(stream):
+    return [statement.tree for statement in ProgramParser(stream).parse()]
+
+
+if __name__ == "__main__":
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "program.txt")
+        with open(file_path, "w") as file:
+            file.write(generate_program(line_count))
+
+        # lexing + parsing, the way each approach is used. The two use different lexers, so this
+        # mostly measures ParseTree.lexer's loop over one regex per token type against the
+        # TokenStream master regex, not the parsers.
+        start = time.perf_counter()
+        per_line_trees = parse_per_line(ParseTree.lexer(file_path))
+        per_line_total = time.perf_counter() - start
+        start = time.perf_counter()
+        stream = TokenStream.from_file(file_path, ParseTree.TOKEN_TYPES)
+        program_trees = parse_program(stream)
+        program_total = time.perf_counter() - start
+
+    if per_line_trees != program_trees:
+        raise SystemExit("Parse trees differ")
+
+    # parsing alone, both parsers fed the same tokens, already lexed. ProgramParser is slower here:
+    # it slices every lexeme out of the source as it parses, work the tuples did at lexing time.
+    tokens_per_line = [[tuple(token) for token in line_tokens] for line_tokens in stream.line_slices()]
+    start = time.perf_counter()
+    parse_per_line(tokens_per_line)
+    per_line_parse = time.perf_counter() - start
+    start = time.perf_counter()
+    parse_program(stream)
+    program_parse = time.perf_counter() - start
+
+    print(f"Statements: {line_count}")
+    print(f"{'':22}{'lex + parse':>26}{'parse only':>26}")
+    for name, total, parse in (("Parser per line", per_line_total, per_line_parse),
+                               ("ProgramParser", program_total, program_parse)):
+        print(f"{name:<22}{line_count / total:>15,.0f} stmts/s{line_count / parse:>18,.0f} stmts/s")
+    print(f"Parsing alone, ProgramParser runs at {per_line_parse / program_parse:.0%} of the speed of a "
+          f"Parser per line; the lex + parse gain comes from the lexer.")
@@ -0,0 +1,71 @@
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Symoble-Table"))
+
+from ScopedTable import ScopedTable
+
+
+# One dict per scope, searched from the innermost outwards: O(depth) resolve.
+class ChainedTable:
+    def __init__(self):
+        self.scopes = [{}]
+
+    def enter_scope(self):
+        self.scopes.append({})
+
+    def exit_scope(self):
+        self.scopes.pop()
+
+    def declare(self, name, value=None):
+        self.scopes[-1][name] = value
+
+    def resolve(self, name, default=None):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return default
+
+
+# A full copy of the visible names per scope: O(1) resolve, O(visible names) enter_scope.
+class CopyingTable(ChainedTable):
+    def enter_scope(self):
+        self.scopes.append(dict(self.scopes[-1]))
+
+    def resolve(self, name, default=None):
+        return self.scopes[-1].get(name, default)
+
+
+# depth nested scopes, each declaring a local of its own and shadowing one name of the scope
+# around it; then names are resolved at the deepest point and all scopes are closed.
+def nest(table, depth, resolves):
+    start = time.perf_counter()
+    table.declare("global_0")
+    for level in range(depth):
+        table.enter_scope()
+        table.declare(f"local_{level}", level)
+        table.declare("shadowed", level)
+    nest_time = time.perf_counter() - start
+
+    names = ["shadowed", "global_0", f"local_{depth // 2}", "missing"]
+    start = time.perf_counter()
+    for i in range(resolves):
+        table.resolve(names[i & 3])
+    resolve_time = (time.perf_counter() - start) / resolves
+
+    start = time.perf_counter()
+    for _ in range(depth):
+        table.exit_scope()
+    return nest_time, resolve_time, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    gc.disable()
+    for depth in (1_000, 10_000):
+        print(f"{depth} nested scopes")
+        for table_type in (ScopedTable, ChainedTable, CopyingTable):
+            nest_time, resolve_time, unnest_time = nest(table_type(), depth, 20_000)
+            print(f"  {table_type.__name__:>12}: enter+declare {nest_time / depth * 1e6:7.2f} us per scope, "
+                  f"resolve {resolve_time * 1e6:8.2f} us, exit {unnest_time / depth * 1e6:5.2f} us per scope")
@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ProgramParser import ProgramParser
+from SyntaxTree import Arena, ArenaBuilder, NodeBuilder, parse_assignments
+from TokenStream import TokenStream
+
+from ParserBenchmark import generate_program
+from TokenStreamBenchmark import allocated_by
+
+
+if __name__ == "__main__":
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    stream = TokenStream.from_text(generate_program(line_count))
+
+    tuples, tuples_size = allocated_by(lambda: [statement.tree for statement in ProgramParser(stream).parse()])
+    del tuples
+    nodes, nodes_size = allocated_by(lambda: parse_assignments(stream, NodeBuilder()))
+    del nodes
+
+    def build_arena():
+        arena = Arena(stream.source)
+        roots = parse_assignments(stream, ArenaBuilder(arena))
+        return arena, roots
+
+    (arena, roots), arena_size = allocated_by(build_arena)
+    node_count = len(arena)
+    # the list of root indexes is bookkeeping for this script, not part of the tree
+    roots_size = sys.getsizeof(roots) + sum(sys.getsizeof(root) for root in roots if root > 256)
+    arena_size -= roots_size
+
+    # Only the arena is smaller than the tuples: a __slots__ node has no __dict__, but it is still
+    # one object per node plus int objects for its offsets, so it is the largest of the three.
+    print(f"Statements: {line_count}, nodes: {node_count}")
+    for name, size in (("Nested tuples", tuples_size), ("__slots__ nodes", nodes_size), ("Arena", arena_size)):
+        print(f"{name:<16}: {size / 2**20:8.1f} MB  ({size / node_count:5.1f} bytes/node, "
+              f"{size / tuples_size:.2f}x the tuples)")
@@ -0,0 +1,42 @@
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TokenStream import TokenStream
+from TokensAndLexem import lexer
+
+from LexerBenchmark import generate_source
+
+
+# Bytes allocated (and still alive) while building the result of function().
+def allocated_by(function):
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "source.txt")
+        generate_source(file_path, size_mb)
+        with open(file_path) as file:
+            text = file.read()
+        tuples, tuples_size = allocated_by(lambda: lexer(file_path))
+        count = sum(len(line_tokens) for line_tokens in tuples)
+        del tuples
+        # the source text is shared with the caller, so only the columns are counted
+        stream, stream_size = allocated_by(lambda: TokenStream.from_text(text))
+        assert len(stream) == count
+
+    print(f"Tokens           : {count}")
+    print(f"Lists of tuples  : {tuples_size / 2**20:8.1f} MB  ({tuples_size / count:.1f} bytes/token)")
+    print(f"TokenStream      : {stream_size / 2**20:8.1f} MB  ({stream_size / count:.1f} bytes/token)")
+    print(f"Reduction        : {tuples_size / stream_size:.1f}x")
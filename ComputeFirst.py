@@ -1,60 +1,80 @@
+from Digraph import digraph
+from Grammar import Grammar
+
+
+# FIRST sets of a Grammar as one bitset per nonterminal id, bit i standing for terminal id
+# nonterminal_count + i; whether a nonterminal derives the empty string is grammar.nullable.
+# The "FIRST(A) includes FIRST(X)" relation is built once from the nullable prefixes of the
+# productions and solved with the digraph algorithm, so every edge is followed once instead of
+# rescanning all productions until nothing changes.
+def first_bitsets(grammar):
+    nonterminal_count = grammar.nonterminal_count
+    nullable = grammar.nullable
+    symbols, offsets = grammar.production_symbols, grammar.production_offsets
+    direct = [0] * nonterminal_count
+    edges = []
+    for nonterminal in range(nonterminal_count):
+        includes = set()
+        for number in grammar.productions_of(nonterminal):
+            for position in range(offsets[number], offsets[number + 1]):
+                symbol = symbols[position]
+                if symbol >= nonterminal_count:  # a terminal ends the prefix
+                    direct[nonterminal] |= 1 << (symbol - nonterminal_count)
+                    break
+                includes.add(symbol)
+                if not nullable[symbol]:
+                    break
+        includes.discard(nonterminal)
+        edges.append(list(includes))
+    return digraph(direct, edges)
+
+
+# FIRST of a sequence of symbol ids given the first_bitsets of its grammar: (bitset, whether the
+# whole sequence can derive the empty string).
+def first_of_sequence(grammar, first, sequence):
+    nonterminal_count = grammar.nonterminal_count
+    bits = 0
+    for symbol in sequence:
+        if symbol >= nonterminal_count:
+            return bits | 1 << (symbol - nonterminal_count), False
+        bits |= first[symbol]
+        if not grammar.nullable[symbol]:
+            return bits, False
+    return bits, True
+
+
+# FIRST set of every nonterminal as a set of terminal names, with '' in it when the nonterminal
+# can derive the empty string. grammar is a Grammar or a rules dict (see Grammar).
 def compute_first(grammar):
+    grammar = Grammar.of(grammar)
+    return named_first_sets(grammar, first_bitsets(grammar))
 
-    # Initialize an empty set for each non-terminal symbol in the grammar.
-    first_sets = {}
-    for symbol in grammar:
-        first_sets[symbol] = set()
-
-    while True:
-        updated = False
-        # For each production of the symbol
-        for symbol in grammar:
-            for production in grammar[symbol]:
-                i = 0
-                while i < len(production):
-                    # Check the first symbol in the production.
-                    first_symbol = production[i]
-                    if first_symbol in grammar:  # Non-terminal symbol
-                        if '' not in first_sets[first_symbol]:  # If epsilon not in First(first_symbol)
-                            break # If epsilon is not in the First set of the non-terminal, break the loop.
-
-                        # Otherwise, add all terminals in the First set of the non-terminal to the First set of the current symbol.
-                        for terminal in first_sets[first_symbol]:
-                            if terminal != '':
-                                if terminal not in first_sets[symbol]:
-                                    first_sets[symbol].add(terminal)
-                                    updated = True
-                        i += 1
-
-                    # Terminal symbol
-                    else:  
-                        if first_symbol not in first_sets[symbol]:
-                            first_sets[symbol].add(first_symbol)
-                            updated = True
-                        break  # Move to the next production
-                else:  # Loop completed without breaking, so epsilon production
-                    if '' not in first_sets[symbol]:
-                        first_sets[symbol].add('')
-                        updated = True
-                    if i == len(production):  # All symbols in the production are non-terminal
-                        if '' not in first_sets[symbol]:
-                            first_sets[symbol].add('')
-                            updated = True
-
-        if not updated:
-            break
 
+# first_bitsets in the compute_first format.
+def named_first_sets(grammar, first):
+    first_sets = {}
+    for nonterminal, bits in enumerate(first):
+        first_set = set(grammar.terminal_names(bits))
+        if grammar.nullable[nonterminal]:
+            first_set.add('')
+        first_sets[grammar.symbols[nonterminal]] = first_set
     return first_sets
 
 
 # Example usage
+if __name__ == "__main__":
+    grammar = {
+        'S': ['bXY'],
+        'X': ['b', 'c'],
+        'Y': ['b', ''],
+    }
 
-grammar = {
-    'S': ['bXY'],
-    'X': ['b', 'c'],
-    'Y': ['b', ''],
-}
-
-# Compute First sets
-first_sets = compute_first(grammar)
-print('First sets:', first_sets)
\ No newline at end of file
+    # Compute First sets
+    first_sets = compute_first(grammar)
+    print('First sets:', first_sets)
+    print('First sets:', compute_first(Grammar.from_text("""
+        Statement -> IDENTIFIER '=' Expr | Expr
+        Expr      -> Term Rest
+        Rest      -> '+' Term Rest |
+        Term      -> NUMBER | IDENTIFIER | '(' Expr ')'
+    """)))
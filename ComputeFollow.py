@@ -1,97 +1,83 @@
-def compute_first(grammar):
+from ComputeFirst import compute_first, first_bitsets
+from Digraph import digraph
+from Grammar import END_MARKER, Grammar
 
-    # Initialize an empty set for each non-terminal symbol in the grammar.
-    first_sets = {}
-    for symbol in grammar:
-        first_sets[symbol] = set()
 
-    while True:
-        updated = False
-        # For each production of the symbol
-        for symbol in grammar:
-            for production in grammar[symbol]:
-                i = 0
-                while i < len(production):
-                    # Check the first symbol in the production.
-                    first_symbol = production[i]
-                    if first_symbol in grammar:  # Non-terminal symbol
-                        if '' not in first_sets[first_symbol]:  # If epsilon not in First(first_symbol)
-                            break # If epsilon is not in the First set of the non-terminal, break the loop.
+# FOLLOW sets of a Grammar with the DeRemer-Pennello digraph method, as one bitset per
+# nonterminal id in the first_bitsets layout. One pass over the productions gives, for every
+# occurrence A -> alpha B beta,
+#   - the terminals FIRST(beta) contributes directly to FOLLOW(B), and
+#   - the inclusion FOLLOW(B) includes FOLLOW(A) when beta can derive the empty string.
+# The inclusion relation is then solved in one traversal with its cycles collapsed.
+def follow_bitsets(grammar, first=None):
+    if first is None:
+        first = first_bitsets(grammar)
+    nonterminal_count = grammar.nonterminal_count
+    nullable = grammar.nullable
+    symbols, offsets, production_lhs = grammar.production_symbols, grammar.production_offsets, grammar.production_lhs
+    direct = [0] * nonterminal_count
+    includes = [set() for _ in range(nonterminal_count)]
+    direct[grammar.start] = 1 << (grammar.end_id - nonterminal_count)
+    for number in range(grammar.production_count):
+        owner = production_lhs[number]
+        # walk right to left keeping FIRST of the suffix after the current symbol
+        suffix_first = 0
+        suffix_nullable = True
+        for position in range(offsets[number + 1] - 1, offsets[number] - 1, -1):
+            symbol = symbols[position]
+            if symbol >= nonterminal_count:
+                suffix_first = 1 << (symbol - nonterminal_count)
+                suffix_nullable = False
+                continue
+            direct[symbol] |= suffix_first
+            if suffix_nullable and symbol != owner:
+                includes[symbol].add(owner)
+            if nullable[symbol]:  # the suffix keeps what follows the symbol
+                suffix_first |= first[symbol]
+            else:
+                suffix_first = first[symbol]
+                suffix_nullable = False
+    return digraph(direct, [list(owners) for owners in includes])
 
-                        # Otherwise, add all terminals in the First set of the non-terminal to the First set of the current symbol.
-                        for terminal in first_sets[first_symbol]:
-                            if terminal != '':
-                                if terminal not in first_sets[symbol]:
-                                    first_sets[symbol].add(terminal)
-                                    updated = True
-                        i += 1
 
-                    # Terminal symbol
-                    else:  
-                        if first_symbol not in first_sets[symbol]:
-                            first_sets[symbol].add(first_symbol)
-                            updated = True
-                        break  # Move to the next production
-                else:  # Loop completed without breaking, so epsilon production
-                    if '' not in first_sets[symbol]:
-                        first_sets[symbol].add('')
-                        updated = True
-                    if i == len(production):  # All symbols in the production are non-terminal
-                        if '' not in first_sets[symbol]:
-                            first_sets[symbol].add('')
-                            updated = True
+# FOLLOW set of every nonterminal as a frozenset of terminal names, END_MARKER following the
+# start symbol. grammar is a Grammar or a rules dict (see Grammar); first_sets, when given, are
+# compute_first's sets for it.
+def compute_follow(grammar, start_symbol=None, first_sets=None):
+    grammar = Grammar.of(grammar, start_symbol)
+    first = None
+    if first_sets is not None:
+        ids, nonterminal_count = grammar.ids, grammar.nonterminal_count
+        first = [sum(1 << (ids[terminal] - nonterminal_count) for terminal in first_sets[symbol] if terminal)
+                 for symbol in grammar.symbols[:nonterminal_count]]
+    return named_follow_sets(grammar, follow_bitsets(grammar, first))
 
-        if not updated:
-            break
 
-    return first_sets
+# follow_bitsets in the compute_follow format.
+def named_follow_sets(grammar, follow):
+    return {grammar.symbols[nonterminal]: frozenset(grammar.terminal_names(bits))
+            for nonterminal, bits in enumerate(follow)}
 
 
-def compute_follow(grammar, start_symbol, first_sets=None):
-    if first_sets is None:
-        first_sets = compute_first(grammar)
-
-    follow_sets = {symbol: set() for symbol in grammar}
-    follow_sets[start_symbol].add('$')
-
-    updated = True
-    while updated:
-        updated = False
-        for symbol in grammar:
-            for production in grammar[symbol]:
-                for i, symbol_or_epsilon in enumerate(production):
-                    if symbol_or_epsilon in grammar:  # Non-terminal symbol
-                        if i == len(production) - 1:  # Last symbol in the production
-                            if symbol_or_epsilon not in follow_sets:
-                                follow_sets[symbol_or_epsilon] = set()
-                            follow_sets[symbol_or_epsilon].update(follow_sets[symbol])
-                        else:
-                            j = i + 1
-                            while j < len(production) and '' in first_sets.get(production[j], set()):
-                                follow_sets[symbol_or_epsilon].update(set(first_sets.get(production[j], set())) - {''})
-                                if j + 1 < len(production) and '' in first_sets.get(production[j + 1], set()):
-                                    follow_sets[symbol_or_epsilon].update(follow_sets[production[j]])
-                                j += 1
-                            if j == len(production):
-                                follow_sets[symbol_or_epsilon].update(follow_sets[symbol])
-                            else:
-                                follow_sets[symbol_or_epsilon].update(set(first_sets.get(production[j], set())) - {''})
-
-    return follow_sets
-
 # Example usage
+if __name__ == "__main__":
+    grammar = {
+        'S': ['bXY'],
+        'X': ['b', 'c'],
+        'Y': ['b', '']
+    }
+    start_symbol = 'S'
 
-grammar = {
-    'S': ['bXY'],
-    'X': ['b', 'c'],
-    'Y': ['b', '']
-}
-start_symbol = 'S'
-
-# Compute First sets
-first_sets = compute_first(grammar)
-print('First sets:', first_sets)
+    # Compute First sets
+    first_sets = compute_first(grammar)
+    print('First sets:', first_sets)
 
-# Compute Follow sets
-follow_sets = compute_follow(grammar, start_symbol, first_sets)
-print('Follow sets:', follow_sets)
\ No newline at end of file
+    # Compute Follow sets
+    follow_sets = compute_follow(grammar, start_symbol, first_sets)
+    print('Follow sets:', follow_sets)
+    print('Follow sets:', compute_follow(Grammar.from_text("""
+        Statement -> IDENTIFIER '=' Expr | Expr
+        Expr      -> Term Rest
+        Rest      -> '+' Term Rest |
+        Term      -> NUMBER | IDENTIFIER | '(' Expr ')'
+    """)))
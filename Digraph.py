@@ -0,0 +1,52 @@
+# DeRemer and Pennello's digraph algorithm. Given a relation R over nodes 0..n-1 (edges[x] lists
+# the y with x R y) and an initial bitset F'(x) per node, it computes the smallest F with
+#     F(x) = F'(x) | union of F(y) for every x R y
+# in one depth-first traversal. Nodes on a cycle form one strongly connected component and share
+# its union, so no set is revisited until a fixpoint is reached. Sets are ints used as bitsets.
+# The traversal keeps its own stack, so long dependency chains do not hit the recursion limit.
+def digraph(values, edges):
+    node_count = len(values)
+    finished = node_count + 1  # depth given to nodes whose component is complete
+    result = list(values)
+    depth = [0] * node_count
+    stack = []
+    for root in range(node_count):
+        if depth[root]:
+            continue
+        stack.append(root)
+        depth[root] = len(stack)
+        work = [[root, 0, len(stack)]]  # node, next successor, depth on entry
+        while work:
+            frame = work[-1]
+            node, position = frame[0], frame[1]
+            successors = edges[node]
+            if position < len(successors):
+                frame[1] = position + 1
+                successor = successors[position]
+                if not depth[successor]:
+                    stack.append(successor)
+                    depth[successor] = len(stack)
+                    work.append([successor, 0, len(stack)])
+                    continue
+                if depth[successor] < depth[node]:
+                    depth[node] = depth[successor]
+                result[node] |= result[successor]
+                continue
+
+            # every successor is done: close the component if node is its root, then pass the
+            # result up to the node that reached it
+            work.pop()
+            if depth[node] == frame[2]:
+                union = result[node]
+                while True:
+                    member = stack.pop()
+                    depth[member] = finished
+                    result[member] = union
+                    if member == node:
+                        break
+            if work:
+                parent = work[-1][0]
+                if depth[node] < depth[parent]:
+                    depth[parent] = depth[node]
+                result[parent] |= result[node]
+    return result
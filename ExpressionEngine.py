@@ -0,0 +1,126 @@
+OPERAND_TYPES = {"NUMBER", "IDENTIFIER", "VARIABLE", "STRING"}
+
+LEFT = 'left'
+RIGHT = 'right'
+
+_PARENTHESIS = (float('-inf'), False, None)  # operator stack marker for an open parenthesis
+
+
+# Operator-precedence expression parser that keeps its own stacks instead of recursing, so the
+# nesting depth of parentheses is only limited by memory. That is the whole point: per token it
+# is no faster than ParseTree.Parser (see Benchmark/ExpressionBenchmark.py). Operators are looked
+# up by lexeme in a table, and new binary or prefix unary operators can be registered. With the
+# default table it builds the same trees as ParseTree.Parser.expression:
+#     1 + 2 * (3 - x)  ->  ('+', '1', ('*', '2', ('-', '3', 'x')))
+# Tokens are anything indexing like the lexer's tuples: token[0] is the type, token[1] the lexeme.
+# Operators must be single tokens, so a new operator character reaches the engine as an UNKNOWN
+# token with that lexeme.
+class ExpressionEngine:
+    def __init__(self):
+        self.binary_operators = {}  # lexeme -> (precedence, associativity)
+        self.unary_operators = {}  # lexeme -> precedence
+        self.register_binary('+', 10)
+        self.register_binary('-', 10)
+        self.register_binary('*', 20)
+        self.register_binary('/', 20)
+
+    def register_binary(self, symbol, precedence, associativity=LEFT):
+        if associativity not in (LEFT, RIGHT):
+            raise ValueError(f"Unknown associativity {associativity!r}")
+        self.binary_operators[symbol] = (precedence, associativity == RIGHT)
+
+    def register_unary(self, symbol, precedence):
+        self.unary_operators[symbol] = precedence
+
+    # Node builders; override them to build something other than tuples.
+    def leaf(self, token):
+        return token[1]
+
+    def binary(self, operator_token, left, right):
+        return (operator_token[1], left, right)
+
+    def unary(self, operator_token, operand):
+        return (operator_token[1], operand)
+
+    # Parses one expression starting at tokens[index] and returns (tree, index after it).
+    # The expression ends at the first token that cannot continue it (e.g. a ')' with no open
+    # parenthesis, or the end of tokens), like ParseTree.Parser leaves trailing tokens unread.
+    # With same_line, a binary operator outside parentheses on a later line than the token before
+    # it also ends the expression, as in ProgramParser; the tokens then need a .line (TokenView).
+    def parse(self, tokens, index=0, same_line=False):
+        binary_operators = self.binary_operators
+        unary_operators = self.unary_operators
+        leaf, binary, unary = self.leaf, self.binary, self.unary
+        operands = []
+        # entries: (precedence, is_unary, token); an open parenthesis has precedence -inf so no
+        # operator after it reduces past it
+        operators = []
+        open_parentheses = 0
+        end = len(tokens)
+        expect_operand = True
+
+        while True:
+            if expect_operand:
+                if index >= end:
+                    raise ValueError("Unexpected end of input")
+                token = tokens[index]
+                token_type = token[0]
+                if token_type in OPERAND_TYPES:
+                    operands.append(leaf(token))
+                    expect_operand = False
+                elif token_type == "LPAREN":
+                    operators.append(_PARENTHESIS)
+                    open_parentheses += 1
+                elif token[1] in unary_operators:
+                    operators.append((unary_operators[token[1]], True, token))
+                else:
+                    raise ValueError(f"Unexpected {tuple(token)[:2]} at token {index}")
+                index += 1
+                continue
+
+            if index >= end:
+                break
+            token = tokens[index]
+            token_type = token[0]
+            if token_type not in OPERAND_TYPES and token[1] in binary_operators:
+                if same_line and not open_parentheses and token.line != tokens[index - 1].line:
+                    break
+                precedence, right_associative = binary_operators[token[1]]
+                while operators:
+                    top_precedence, is_unary, operator_token = operators[-1]
+                    if top_precedence < precedence or (top_precedence == precedence and right_associative):
+                        break
+                    operators.pop()
+                    right = operands.pop()
+                    operands.append(unary(operator_token, right) if is_unary else binary(operator_token, operands.pop(), right))
+                operators.append((precedence, False, token))
+                expect_operand = True
+            elif token_type == "RPAREN" and open_parentheses:
+                while True:
+                    top_precedence, is_unary, operator_token = operators.pop()
+                    if operator_token is None:  # the matching parenthesis
+                        break
+                    right = operands.pop()
+                    operands.append(unary(operator_token, right) if is_unary else binary(operator_token, operands.pop(), right))
+                open_parentheses -= 1
+            else:
+                break
+            index += 1
+
+        if open_parentheses:
+            raise ValueError("Expected RPAREN before the end of the expression")
+        while operators:
+            _, is_unary, operator_token = operators.pop()
+            right = operands.pop()
+            operands.append(unary(operator_token, right) if is_unary else binary(operator_token, operands.pop(), right))
+        return operands[0], index
+
+
+if __name__ == "__main__":
+    from TokensAndLexem import tokenize_line
+
+    engine = ExpressionEngine()
+    engine.register_unary('-', 30)
+    engine.register_binary('^', 40, RIGHT)
+    for text in ["1 + 2 * (3 - x)", "a - b - c", "2 ^ 3 ^ 2", "-x * 2", "(" * 5 + "y" + ")" * 5]:
+        print(text, "->", engine.parse(tokenize_line(text, 1))[0])
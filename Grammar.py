@@ -0,0 +1,210 @@
+import re
+from array import array
+from itertools import compress
+
+END_MARKER = '$'
+
+_GRAMMAR_TOKEN = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|#.*|->|\||[^\s'"|#]+""")
+_DIGIT_VALUES = bytes.maketrans(b'01', b'\x00\x01')
+
+
+# A context-free grammar with its symbols interned to dense ints:
+#   symbols        - id -> name: nonterminals 0..N-1 in definition order, then the terminals in
+#                    order of first use, then END_MARKER
+#   ids            - name -> id
+#   terminal       - per symbol id, 1 for terminals (ids >= nonterminal_count)
+#   nullable       - per symbol id, 1 for nonterminals that derive the empty string
+# Productions are numbered in definition order, those of nonterminal n being
+# rule_offsets[n] .. rule_offsets[n + 1] - 1. Production p is production_lhs[p] ->
+# production_symbols[production_offsets[p]:production_offsets[p + 1]].
+#
+# rules is a {nonterminal: [production, ...]} dict. A production is a sequence of symbol names;
+# a string production is the compute_first format where every character is one symbol, so the
+# grammar dicts used so far convert as they are. Symbols that have no rules are terminals.
+class Grammar:
+    def __init__(self, rules, start_symbol=None):
+        if not rules:
+            raise ValueError("A grammar needs at least one rule")
+        if start_symbol is None:
+            start_symbol = next(iter(rules))
+        if start_symbol not in rules:
+            raise ValueError(f"Start symbol {start_symbol!r} has no rules")
+        self.start_symbol = start_symbol
+
+        self.symbols = list(rules)
+        self.nonterminal_count = len(self.symbols)
+        self.ids = {symbol: symbol_id for symbol_id, symbol in enumerate(self.symbols)}
+        for productions in rules.values():
+            for production in productions:
+                for symbol in production:
+                    if symbol not in self.ids and symbol != END_MARKER:
+                        self.ids[symbol] = len(self.symbols)
+                        self.symbols.append(symbol)
+        self.ids[END_MARKER] = self.end_id = len(self.symbols)
+        self.symbols.append(END_MARKER)
+        self.terminal_count = len(self.symbols) - self.nonterminal_count
+        self.start = self.ids[start_symbol]
+
+        self.rule_offsets = array('i', [0])
+        self.production_lhs = array('i')
+        self.production_offsets = array('i', [0])
+        self.production_symbols = array('i')
+        ids = self.ids
+        for nonterminal, productions in rules.items():
+            lhs = ids[nonterminal]
+            for production in productions:
+                self.production_lhs.append(lhs)
+                self.production_symbols.extend(ids[symbol] for symbol in production)
+                self.production_offsets.append(len(self.production_symbols))
+            self.rule_offsets.append(len(self.production_lhs))
+
+        self.terminal = bytearray(self.nonterminal_count) + bytearray(b'\x01') * self.terminal_count
+        self.nullable = self._nullable()
+
+    # Accepts a Grammar or a rules dict; a Grammar with another start symbol is re-rooted.
+    @classmethod
+    def of(cls, grammar, start_symbol=None):
+        if isinstance(grammar, Grammar):
+            if start_symbol is None or start_symbol == grammar.start_symbol:
+                return grammar
+            return cls(grammar.rules(), start_symbol)
+        return cls(grammar, start_symbol)
+
+    # Text format, one rule per line, alternatives separated by '|':
+    #     Expr -> Expr '+' Term | Term
+    #           | '-' Expr
+    #     Opt  -> 'x' |                 # an empty alternative is the empty production
+    # Quoted names are terminals; unquoted names are nonterminals when they have a rule and
+    # terminals otherwise (token types such as NUMBER). A line starting with '|' continues the
+    # rule above it, '#' starts a comment, and the first rule's nonterminal is the start symbol.
+    @classmethod
+    def from_text(cls, text, start_symbol=None):
+        rules = {}
+        current = None
+        for line_number, line in enumerate(text.splitlines(), 1):
+            parts = [part for part in _GRAMMAR_TOKEN.findall(line) if not part.startswith('#')]
+            if not parts:
+                continue
+            if parts[0] == '|':
+                if current is None:
+                    raise ValueError(f"Line {line_number}: '|' without a rule to continue")
+                alternatives = current
+                parts = parts[1:]
+            elif len(parts) >= 2 and parts[1] == '->' and parts[0][0] not in '\'"':
+                alternatives = current = rules.setdefault(parts[0], [])
+                parts = parts[2:]
+            else:
+                raise ValueError(f"Line {line_number}: expected 'Name -> ...', got {line.strip()!r}")
+            production = []
+            for part in parts + ['|']:
+                if part == '|':
+                    alternatives.append(tuple(production))
+                    production = []
+                elif part == '->':
+                    raise ValueError(f"Line {line_number}: unexpected '->'")
+                elif part[0] in '\'"':
+                    name = re.sub(r'\\(.)', r'\1', part[1:-1])
+                    if name:  # '' is the empty string, not a symbol
+                        production.append(name)
+                else:
+                    production.append(part)
+        if not rules:
+            raise ValueError("A grammar needs at least one rule")
+        return cls(rules, start_symbol)
+
+    # Nonterminals that derive the empty string. Each production counts its symbols not yet known
+    # to be nullable; when a nonterminal becomes nullable only the productions using it are updated.
+    def _nullable(self):
+        nullable = bytearray(len(self.symbols))
+        remaining = array('i')
+        uses = [[] for _ in range(self.nonterminal_count)]
+        worklist = []
+        for number in range(len(self.production_lhs)):
+            rhs = self.rhs(number)
+            remaining.append(len(rhs))
+            if any(self.terminal[symbol] for symbol in rhs):  # never nullable
+                continue
+            for symbol in rhs:
+                uses[symbol].append(number)
+            if not rhs and not nullable[self.production_lhs[number]]:
+                nullable[self.production_lhs[number]] = 1
+                worklist.append(self.production_lhs[number])
+        while worklist:
+            for number in uses[worklist.pop()]:
+                remaining[number] -= 1
+                lhs = self.production_lhs[number]
+                if remaining[number] == 0 and not nullable[lhs]:
+                    nullable[lhs] = 1
+                    worklist.append(lhs)
+        return nullable
+
+    @property
+    def production_count(self):
+        return len(self.production_lhs)
+
+    def productions_of(self, nonterminal_id):
+        return range(self.rule_offsets[nonterminal_id], self.rule_offsets[nonterminal_id + 1])
+
+    def rhs(self, number):
+        return self.production_symbols[self.production_offsets[number]:self.production_offsets[number + 1]]
+
+    # (lhs name, tuple of symbol names) of a production.
+    def production_text(self, number):
+        symbols = self.symbols
+        return symbols[self.production_lhs[number]], tuple(symbols[symbol] for symbol in self.rhs(number))
+
+    # The rules dict with every production as a tuple of names.
+    def rules(self):
+        rules = {symbol: [] for symbol in self.symbols[:self.nonterminal_count]}
+        for number in range(self.production_count):
+            lhs, production = self.production_text(number)
+            rules[lhs].append(production)
+        return rules
+
+    # The grammar with a new start symbol S' and S' -> start as nonterminal 0 and production 0,
+    # as LR automata need.
+    def augmented(self):
+        start = self.start_symbol + "'"
+        while start in self.ids:
+            start += "'"
+        rules = {start: [(self.start_symbol,)]}
+        rules.update(self.rules())
+        return Grammar(rules, start)
+
+    # Names of the terminals in a bitset whose bit i stands for terminal id nonterminal_count + i.
+    # The binary digits, lowest bit first, select the names through itertools.compress, which
+    # keeps the loop over the bits in C.
+    def terminal_names(self, bits):
+        digits = bin(bits)[:1:-1].encode().translate(_DIGIT_VALUES)
+        return list(compress(self.symbols[self.nonterminal_count:], digits))
+
+    # Terminal id of a lexer token: its type when that is a terminal of the grammar (e.g. NUMBER),
+    # otherwise its lexeme (e.g. '+').
+    def terminal_id(self, token):
+        return terminal_id(self.ids, self.nonterminal_count, token)
+
+
+def terminal_id(ids, nonterminal_count, token):
+    symbol_id = ids.get(token[0])
+    if symbol_id is None or symbol_id < nonterminal_count:
+        symbol_id = ids.get(token[1])
+    if symbol_id is None or symbol_id < nonterminal_count:
+        raise ValueError(f"Token {tuple(token)[:2]} is not a terminal of the grammar")
+    return symbol_id
+
+
+if __name__ == "__main__":
+    grammar = Grammar.from_text("""
+        # expressions over the lexer's token types
+        Expr   -> Expr '+' Term | Expr '-' Term | Term
+        Term   -> Term '*' Factor
+                | Term '/' Factor
+                | Factor
+        Factor -> '(' Expr ')' | NUMBER | IDENTIFIER | Sign Factor
+        Sign   -> '-' |
+    """)
+    print("Symbols:", grammar.symbols)
+    print("Nullable:", [symbol for symbol in grammar.symbols if grammar.nullable[grammar.ids[symbol]]])
+    for number in range(grammar.production_count):
+        lhs, production = grammar.production_text(number)
+        print(f"  {number}: {lhs} -> {' '.join(production) or 'ε'}")
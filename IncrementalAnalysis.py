@@ -0,0 +1,251 @@
+from collections import Counter, namedtuple
+
+from Digraph import digraph
+from Grammar import END_MARKER, Grammar
+
+# Nonterminals whose nullable flag, FIRST set or FOLLOW set changed in an edit. A parse table
+# only needs the rows of these nonterminals (and of productions using them) patched.
+Changes = namedtuple('Changes', ['nullable', 'first', 'follow'])
+
+
+# Keeps the nullable flags, FIRST and FOLLOW sets of a grammar up to date while productions are
+# added and removed. An edit re-derives only the region of the grammar that can see it:
+#   - FIRST/nullable: the edited nonterminal and every nonterminal that uses it, directly or
+#     not, after a prefix of nonterminals (a prefix that is or may become nullable);
+#   - FOLLOW: the nonterminals of the edited production, those standing before a symbol whose
+#     FIRST/nullable changed, and every nonterminal whose FOLLOW includes one of them.
+# The sets of the region are reset and solved again with the digraph algorithm, taking the sets
+# outside the region as they are. Re-deriving instead of patching handles removals as well as
+# additions. Sets are bitsets over terminal numbers, END_MARKER being 0.
+class IncrementalAnalysis:
+    def __init__(self, grammar, start_symbol=None):
+        grammar = Grammar.of(grammar, start_symbol)
+        self.start_symbol = grammar.start_symbol
+        self.productions = grammar.rules()  # nonterminal -> [tuple of names]
+        self.terminals = [END_MARKER]
+        self.terminal_ids = {END_MARKER: 0}
+        # symbol -> Counter of the (nonterminal, production) pairs using it; a grammar may list the
+        # same production twice, and removing one copy must leave the other
+        self.uses = {}
+        for nonterminal, productions in self.productions.items():
+            for production in productions:
+                self._index(nonterminal, production)
+        self.nullable = set()
+        self.first = {}
+        self.follow = {}
+        self._recompute_all()
+
+    def _index(self, nonterminal, production):
+        for symbol in set(production):
+            self.uses.setdefault(symbol, Counter())[(nonterminal, production)] += 1
+            if symbol not in self.productions and symbol not in self.terminal_ids:
+                self.terminal_ids[symbol] = len(self.terminals)
+                self.terminals.append(symbol)
+
+    def _recompute_all(self):
+        everything = set(self.productions)
+        return self._update(everything, everything)
+
+    # Productions are sequences of symbol names; a string is one symbol per character, as in the
+    # rules dicts Grammar accepts.
+    def add_production(self, nonterminal, production):
+        production = tuple(production)
+        if production in self.productions.get(nonterminal, ()):
+            raise ValueError(f"{nonterminal} -> {' '.join(production)} is already in the grammar")
+        new_nonterminal = nonterminal not in self.productions
+        self.productions.setdefault(nonterminal, []).append(production)
+        self._index(nonterminal, production)
+        if new_nonterminal and nonterminal in self.terminal_ids:
+            return self._recompute_all()  # a terminal until now: every production using it changes
+        return self._edited(nonterminal, production, {nonterminal} if new_nonterminal else ())
+
+    # A nonterminal losing its last production stays a nonterminal that derives nothing.
+    def remove_production(self, nonterminal, production):
+        production = tuple(production)
+        if production not in self.productions.get(nonterminal, ()):
+            raise ValueError(f"{nonterminal} -> {' '.join(production)} is not in the grammar")
+        self.productions[nonterminal].remove(production)
+        for symbol in set(production):
+            uses = self.uses[symbol]
+            uses[(nonterminal, production)] -= 1
+            if not uses[(nonterminal, production)]:
+                del uses[(nonterminal, production)]
+        return self._edited(nonterminal, production)
+
+    def _edited(self, nonterminal, production, follow_seeds=()):
+        follow_seeds = set(follow_seeds)
+        follow_seeds.update(symbol for symbol in production if symbol in self.productions)
+        return self._update({nonterminal}, follow_seeds)
+
+    # Nonterminals X whose FIRST may include FIRST(symbol): symbol follows only nonterminals in
+    # one of X's productions.
+    def _first_dependents(self, symbol):
+        productions = self.productions
+        for nonterminal, production in self.uses.get(symbol, ()):
+            for part in production:
+                if part == symbol:
+                    yield nonterminal
+                    break
+                if part not in productions:
+                    break
+
+    # Nonterminals B whose FOLLOW may include FOLLOW(nonterminal): B is followed only by
+    # nonterminals in one of its productions.
+    def _follow_dependents(self, nonterminal):
+        productions = self.productions
+        for production in productions[nonterminal]:
+            for part in reversed(production):
+                if part not in productions:
+                    break
+                yield part
+
+    # Recomputes FIRST/nullable for first_seeds and everything depending on them, then FOLLOW for
+    # follow_seeds, the nonterminals before a symbol whose FIRST/nullable changed and everything
+    # depending on those.
+    def _update(self, first_seeds, follow_seeds):
+        region = self._closure(first_seeds, self._first_dependents)
+        old_nullable = {symbol for symbol in region if symbol in self.nullable}
+        old_first = {symbol: self.first.get(symbol) for symbol in region}
+        self._solve_first(region)
+        changed_nullable = {symbol for symbol in region if (symbol in self.nullable) != (symbol in old_nullable)}
+        changed_first = {symbol for symbol in region if self.first[symbol] != old_first[symbol]}
+
+        follow_seeds = set(follow_seeds)
+        for symbol in changed_nullable | changed_first:
+            for nonterminal, production in self.uses.get(symbol, ()):
+                for position, part in enumerate(production):
+                    if part == symbol:
+                        follow_seeds.update(before for before in production[:position] if before in self.productions)
+        region = self._closure(follow_seeds, self._follow_dependents)
+        old_follow = {symbol: self.follow.get(symbol) for symbol in region}
+        self._solve_follow(region)
+        changed_follow = {symbol for symbol in region if self.follow[symbol] != old_follow[symbol]}
+        return Changes(changed_nullable, changed_first, changed_follow)
+
+    @staticmethod
+    def _closure(seeds, dependents):
+        region = set(seeds)
+        work = list(region)
+        while work:
+            for dependent in dependents(work.pop()):
+                if dependent not in region:
+                    region.add(dependent)
+                    work.append(dependent)
+        return region
+
+    def _solve_first(self, region):
+        productions, nullable, first, terminal_ids = self.productions, self.nullable, self.first, self.terminal_ids
+        nullable.difference_update(region)
+
+        # nullable: every production of the region counts its symbols inside the region; one
+        # outside the region must already be nullable, or the production never is
+        remaining = []
+        owners = []
+        waiting = {}
+        worklist = []
+        for nonterminal in region:
+            for production in productions[nonterminal]:
+                if any(part not in region and part not in nullable for part in production):
+                    continue
+                inside = [part for part in production if part in region]
+                if not inside:
+                    if nonterminal not in nullable:
+                        nullable.add(nonterminal)
+                        worklist.append(nonterminal)
+                    continue
+                for part in inside:
+                    waiting.setdefault(part, []).append(len(remaining))
+                remaining.append(len(inside))
+                owners.append(nonterminal)
+        while worklist:
+            for number in waiting.get(worklist.pop(), ()):
+                remaining[number] -= 1
+                if remaining[number] == 0 and owners[number] not in nullable:
+                    nullable.add(owners[number])
+                    worklist.append(owners[number])
+
+        # FIRST: outside sets are final and enter as direct bits, inside ones as digraph edges
+        members = list(region)
+        ids = {symbol: number for number, symbol in enumerate(members)}
+        direct = [0] * len(members)
+        edges = []
+        for number, nonterminal in enumerate(members):
+            includes = set()
+            for production in productions[nonterminal]:
+                for part in production:
+                    if part not in productions:
+                        direct[number] |= 1 << terminal_ids[part]
+                        break
+                    if part in ids:
+                        includes.add(ids[part])
+                    else:
+                        direct[number] |= first[part]
+                    if part not in nullable:
+                        break
+            includes.discard(number)
+            edges.append(list(includes))
+        for symbol, bits in zip(members, digraph(direct, edges)):
+            first[symbol] = bits
+
+    def _solve_follow(self, region):
+        productions, nullable, first, follow = self.productions, self.nullable, self.first, self.follow
+        terminal_ids = self.terminal_ids
+        members = list(region)
+        ids = {symbol: number for number, symbol in enumerate(members)}
+        direct = [0] * len(members)
+        edges = []
+        for number, nonterminal in enumerate(members):
+            includes = set()
+            if nonterminal == self.start_symbol:
+                direct[number] = 1 << terminal_ids[END_MARKER]
+            for owner, production in self.uses.get(nonterminal, ()):
+                for position, part in enumerate(production):
+                    if part != nonterminal:
+                        continue
+                    for after in production[position + 1:]:
+                        if after not in productions:
+                            direct[number] |= 1 << terminal_ids[after]
+                            break
+                        direct[number] |= first[after]
+                        if after not in nullable:
+                            break
+                    else:  # the rest can be empty
+                        if owner in ids:
+                            includes.add(ids[owner])
+                        else:
+                            direct[number] |= follow[owner]
+            includes.discard(number)
+            edges.append(list(includes))
+        for symbol, bits in zip(members, digraph(direct, edges)):
+            follow[symbol] = bits
+
+    def _names(self, bits):
+        return {self.terminals[bit] for bit in range(bits.bit_length()) if bits >> bit & 1}
+
+    # The sets in the compute_first and compute_follow formats.
+    def first_sets(self):
+        return {symbol: self._names(bits) | ({''} if symbol in self.nullable else set())
+                for symbol, bits in self.first.items()}
+
+    def follow_sets(self):
+        return {symbol: frozenset(self._names(bits)) for symbol, bits in self.follow.items()}
+
+    def rules(self):
+        return {nonterminal: list(productions) for nonterminal, productions in self.productions.items()}
+
+
+if __name__ == "__main__":
+    analysis = IncrementalAnalysis(Grammar.from_text("""
+        Expr   -> Term Rest
+        Rest   -> '+' Term Rest |
+        Term   -> NUMBER | '(' Expr ')'
+    """))
+    print("FIRST:", analysis.first_sets())
+    print("FOLLOW:", analysis.follow_sets())
+    print("add Term -> IDENTIFIER Call:", analysis.add_production('Term', ('IDENTIFIER', 'Call')))
+    print("add Call -> '(' Expr ')':", analysis.add_production('Call', ('(', 'Expr', ')')))
+    print("add Call -> (empty):", analysis.add_production('Call', ()))
+    print("FIRST:", analysis.first_sets())
+    print("FOLLOW:", analysis.follow_sets())
+    print("remove Rest -> (empty):", analysis.remove_production('Rest', ()))
+    print("FIRST:", analysis.first_sets())
@@ -0,0 +1,127 @@
+from bisect import bisect_right
+
+from TokensAndLexem import MASTER_REGEX
+
+
+# Tokens of one line as (type, lexeme, column), column being the 0-based offset in the line.
+# Whitespace is skipped rather than stripped first, which gives the same tokens as
+# tokenize_line(line.strip()) while keeping the real columns.
+def _lex_line(line, line_number):
+    line_tokens = []
+    match = MASTER_REGEX.match
+    position = 0
+    end = len(line)
+    while position < end:
+        regex_match = match(line, position)
+        if regex_match is None:
+            raise ValueError(f'Invalid token at line {line_number}: {line[position:]}')
+        token_name = regex_match.lastgroup
+        if token_name != "WHITESPACE":
+            line_tokens.append((token_name, regex_match.group(), position))
+        position = regex_match.end()
+    return line_tokens
+
+
+# Keeps the tokens of a text per line and re-lexes only what an edit touches.
+# No token crosses a line, so the start of the line holding the edit is always a safe restart
+# point, and once the edited lines are re-lexed the old tokens of every following line line up
+# again unchanged. Token positions are stored relative to their line, so those following lines
+# are reused as they are; only their line numbers move, and those are added when reading.
+class IncrementalLexer:
+    def __init__(self, text):
+        self.lines = text.split('\n')
+        self.line_tokens = [_lex_line(line, number) for number, line in enumerate(self.lines, 1)]
+        # Prefix sums over the lines: where each line starts in the text and how many tokens come
+        # before it. Only the first self.valid entries are up to date; an edit cuts that back to
+        # the edited line and the rest is recomputed when an offset past it is asked for.
+        self.line_starts = [0]
+        self.token_starts = [0]
+        self.valid = 1
+
+    @property
+    def text(self):
+        return '\n'.join(self.lines)
+
+    def _extend_prefix(self, line_index):
+        line_starts, token_starts = self.line_starts, self.token_starts
+        del line_starts[self.valid:], token_starts[self.valid:]
+        while len(line_starts) <= min(line_index, len(self.lines) - 1):
+            previous = len(line_starts) - 1
+            line_starts.append(line_starts[previous] + len(self.lines[previous]) + 1)
+            token_starts.append(token_starts[previous] + len(self.line_tokens[previous]))
+        self.valid = len(line_starts)
+
+    # 0-based (line, column) of a text offset.
+    def locate(self, offset):
+        if offset < 0:
+            raise IndexError(f"Offset {offset} is outside the text")
+        while (self.valid < len(self.lines)
+               and self.line_starts[self.valid - 1] + len(self.lines[self.valid - 1]) < offset):
+            self._extend_prefix(2 * self.valid)
+        line = bisect_right(self.line_starts, offset, 0, self.valid) - 1
+        column = offset - self.line_starts[line]
+        if column > len(self.lines[line]):
+            raise IndexError(f"Offset {offset} is outside the text")
+        return line, column
+
+    # Index in the flat token stream of the first token on a line.
+    def token_index(self, line):
+        if line >= self.valid:
+            self._extend_prefix(line)
+        return self.token_starts[line]
+
+    # Replaces deleted_length characters at offset with inserted_text.
+    # Returns (first, old_stop, new_tokens): the tokens [first:old_stop] of the previous stream
+    # were replaced by new_tokens, in the (type, lexeme, "Line : n") shape lexer() uses.
+    # Tokens after old_stop are unchanged apart from their line number, which moves by the
+    # number of lines the edit added or removed.
+    def edit(self, offset, deleted_length, inserted_text):
+        first_line, first_column = self.locate(offset)
+        last_line, last_column = self.locate(offset + deleted_length)
+        new_lines = (self.lines[first_line][:first_column] + inserted_text
+                     + self.lines[last_line][last_column:]).split('\n')
+        new_line_tokens = [_lex_line(line, first_line + number) for number, line in enumerate(new_lines, 1)]
+        old_line_tokens = self.line_tokens[first_line:last_line + 1]
+
+        # Lines whose tokens came out the same at either end are not part of the change.
+        same_before = 0
+        while (same_before < min(len(old_line_tokens), len(new_line_tokens))
+               and old_line_tokens[same_before] == new_line_tokens[same_before]):
+            same_before += 1
+        same_after = 0
+        while (same_after < min(len(old_line_tokens), len(new_line_tokens)) - same_before
+               and old_line_tokens[-1 - same_after] == new_line_tokens[-1 - same_after]):
+            same_after += 1
+
+        first = self.token_index(first_line) + sum(map(len, old_line_tokens[:same_before]))
+        removed = sum(map(len, old_line_tokens[same_before:len(old_line_tokens) - same_after]))
+        changed_lines = new_line_tokens[same_before:len(new_line_tokens) - same_after]
+
+        self.lines[first_line:last_line + 1] = new_lines
+        self.line_tokens[first_line:last_line + 1] = new_line_tokens
+        self.valid = min(self.valid, first_line + 1)
+
+        new_tokens = []
+        for number, line_tokens in enumerate(changed_lines, first_line + same_before + 1):
+            label = f"Line : {number}"
+            new_tokens.extend((token_name, lexeme, label) for token_name, lexeme, _ in line_tokens)
+        return first, first + removed, new_tokens
+
+    # Lines of the text as lexer() counts them: self.lines always ends with the text after the
+    # last '\n' (an edit can make any segment the last one), which is only a line when not empty.
+    def line_count(self):
+        return len(self.lines) - 1 if self.lines[-1] == '' else len(self.lines)
+
+    # The whole token stream, in the same shape lexer() returns (one list per line).
+    def tokens(self):
+        return [[(token_name, lexeme, f"Line : {number}") for token_name, lexeme, _ in line_tokens]
+                for number, line_tokens in enumerate(self.line_tokens[:self.line_count()], 1)]
+
+
+if __name__ == "__main__":
+    with open("text.txt") as file:
+        incremental = IncrementalLexer(file.read())
+    offset = incremental.text.index("3.4")
+    print(incremental.edit(offset, 3, "(7 - 2)"))
+    for line_tokens in incremental.tokens():
+        print(line_tokens)
@@ -0,0 +1,41 @@
+# Dense integer ids for identifiers (and keywords, which lex as identifiers). The first distinct
+# string interned gets id 0, the next 1, and so on, so ids index plain lists and arrays, and
+# names[id] gives the string back. Every occurrence of an identifier can then be carried as its
+# id, or as the one shared copy names[id], instead of a fresh string per occurrence: comparing
+# two ids is an integer compare and hashing one is free.
+class Interner:
+    def __init__(self, names=()):
+        self.ids = {}  # string -> id
+        self.names = []  # id -> string
+        for name in names:  # e.g. keywords, so they get the lowest ids
+            self.intern(name)
+
+    def intern(self, name):
+        identifier = self.ids.get(name)
+        if identifier is None:
+            identifier = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return identifier
+
+    # id of name, or default when it was never interned.
+    def id_of(self, name, default=-1):
+        return self.ids.get(name, default)
+
+    # The shared copy of name, interned on first use.
+    def canonical(self, name):
+        return self.names[self.intern(name)]
+
+    def name(self, identifier):
+        return self.names[identifier]
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+
+if __name__ == "__main__":
+    interner = Interner(["if", "while"])
+    ids = [interner.intern(name) for name in "x = y + x * while_count".split() if name.isidentifier()]
+    print(ids, [interner.name(identifier) for identifier in ids], len(interner))
@@ -0,0 +1,334 @@
+from array import array
+from itertools import chain
+
+import AnalysisCache
+import TableCache
+from ComputeFirst import first_bitsets
+from Grammar import Grammar, terminal_id
+
+# Bump when the table construction or layout changes, so cached tables are rebuilt.
+GENERATOR_VERSION = 2
+
+_PROPAGATE = -1  # the dummy lookahead '#' used to find propagated lookaheads
+
+
+# LALR(1) tables for a Grammar (or a rules dict, see Grammar), built with the lookahead
+# propagation method over the LR(0) automaton.
+#
+# Symbol ids are those of the augmented grammar: nonterminal 0 is the new start S', then the
+# grammar's nonterminals, its terminals and END_MARKER. Production 0 is S' -> start. An action is
+# an int:
+#     0 error,  k > 0 shift to state k - 1,  k < 0 reduce production -k - 1  (reduce 0 = accept)
+# Both tables are packed with row displacement (see _pack_rows). Reduce actions that fill most
+# of a row become that state's default action.
+def build_tables(grammar, start_symbol=None):
+    grammar = Grammar.of(grammar, start_symbol).augmented()
+    symbols = grammar.symbols
+    nonterminal_count = grammar.nonterminal_count
+    end_id = grammar.end_id
+
+    productions = [(grammar.production_lhs[number], tuple(grammar.rhs(number)))
+                   for number in range(grammar.production_count)]
+    productions_of = [grammar.productions_of(nonterminal) for nonterminal in range(nonterminal_count)]
+    first = [{nonterminal_count + bit for bit in range(bits.bit_length()) if bits >> bit & 1}
+             for bits in first_bitsets(grammar)]
+    nullable = grammar.nullable
+
+    # FIRST of the rest of a production after a dot, cached per (production, position)
+    first_after_cache = {}
+
+    def first_after(number, position):
+        key = (number, position)
+        if key not in first_after_cache:
+            result = set()
+            for symbol in productions[number][1][position:]:
+                if symbol >= nonterminal_count:
+                    result.add(symbol)
+                    break
+                result |= first[symbol]
+                if not nullable[symbol]:
+                    break
+            else:
+                first_after_cache[key] = (result, True)
+                return first_after_cache[key]
+            first_after_cache[key] = (result, False)
+        return first_after_cache[key]
+
+    # LR(1) closure of seed items {(production, dot): lookaheads}
+    def closure(seeds):
+        items = {item: set(lookaheads) for item, lookaheads in seeds.items()}
+        work = list(items)
+        while work:
+            number, dot = work.pop()
+            rhs = productions[number][1]
+            if dot >= len(rhs) or rhs[dot] >= nonterminal_count:
+                continue
+            after, after_nullable = first_after(number, dot + 1)
+            lookaheads = after | items[(number, dot)] if after_nullable else after
+            for child in productions_of[rhs[dot]]:
+                current = items.get((child, 0))
+                if current is None:
+                    items[(child, 0)] = set(lookaheads)
+                    work.append((child, 0))
+                elif not lookaheads <= current:
+                    current |= lookaheads
+                    work.append((child, 0))
+        return items
+
+    # LR(0) automaton: states are tuples of kernel items
+    states = [((0, 0),)]
+    state_ids = {states[0]: 0}
+    transitions = []  # state -> {symbol: target state}
+    index = 0
+    while index < len(states):
+        moves = {}
+        for number, dot in closure({item: () for item in states[index]}):
+            rhs = productions[number][1]
+            if dot < len(rhs):
+                moves.setdefault(rhs[dot], []).append((number, dot + 1))
+        row = {}
+        for symbol, kernel in moves.items():
+            kernel = tuple(sorted(kernel))
+            if kernel not in state_ids:
+                state_ids[kernel] = len(states)
+                states.append(kernel)
+            row[symbol] = state_ids[kernel]
+        transitions.append(row)
+        index += 1
+
+    # Spontaneous lookaheads and propagation links between kernel items
+    lookaheads = [{item: set() for item in kernel} for kernel in states]
+    lookaheads[0][(0, 0)].add(end_id)
+    links = {}  # (state, kernel item) -> [(state, kernel item)]
+    for state, kernel in enumerate(states):
+        for kernel_item in kernel:
+            for (number, dot), item_lookaheads in closure({kernel_item: {_PROPAGATE}}).items():
+                rhs = productions[number][1]
+                if dot >= len(rhs):
+                    continue
+                target = (transitions[state][rhs[dot]], (number, dot + 1))
+                for lookahead in item_lookaheads:
+                    if lookahead == _PROPAGATE:
+                        links.setdefault((state, kernel_item), []).append(target)
+                    else:
+                        lookaheads[target[0]][target[1]].add(lookahead)
+    changed = True
+    while changed:
+        changed = False
+        for (state, kernel_item), targets in links.items():
+            source = lookaheads[state][kernel_item]
+            for target_state, target_item in targets:
+                target = lookaheads[target_state][target_item]
+                if not source <= target:
+                    target |= source
+                    changed = True
+
+    # Action and goto rows
+    action_rows, goto_rows, conflicts = [], [], []
+    for state in range(len(states)):
+        row = {}
+        for symbol, target in transitions[state].items():
+            if symbol >= nonterminal_count:
+                row[symbol] = target + 1
+        for (number, dot), item_lookaheads in closure(lookaheads[state]).items():
+            if dot < len(productions[number][1]):
+                continue
+            for lookahead in sorted(item_lookaheads):
+                existing = row.get(lookahead, 0)
+                if existing == 0:
+                    row[lookahead] = -number - 1
+                elif existing != -number - 1:
+                    kind = 'shift/reduce' if existing > 0 else 'reduce/reduce'
+                    conflicts.append((state, symbols[lookahead], kind))
+                    if existing < 0 and -number - 1 > existing:  # keep the earlier production
+                        row[lookahead] = -number - 1
+        action_rows.append({symbol - nonterminal_count: value for symbol, value in row.items()})
+        goto_rows.append({symbol: target for symbol, target in transitions[state].items()
+                          if symbol < nonterminal_count})
+
+    defaults = []
+    for row in action_rows:
+        reductions = [value for value in row.values() if value < -1]  # never default to accept
+        default = max(set(reductions), key=reductions.count) if reductions else 0
+        if default:
+            for column in [column for column, value in row.items() if value == default]:
+                del row[column]
+        defaults.append(default)
+
+    action_base, action_check, action_value = _pack_rows(action_rows)
+    goto_base, goto_check, goto_value = _pack_rows(goto_rows)
+    return {
+        'version': GENERATOR_VERSION,
+        'symbols': symbols,
+        'nonterminal_count': nonterminal_count,
+        'production_lhs': [lhs for lhs, _ in productions],
+        'production_lengths': [len(rhs) for _, rhs in productions],
+        'action_base': action_base,
+        'action_check': action_check,
+        'action_value': action_value,
+        'action_default': defaults,
+        'goto_base': goto_base,
+        'goto_check': goto_check,
+        'goto_value': goto_value,
+        'conflicts': conflicts,
+    }
+
+
+# Row displacement: place each sparse row {column: value} at the lowest offset where none of
+# its columns hit a used slot, most filled rows first. check[] holds the offset of the row that
+# owns a slot, so a lookup is valid when check[base[row] + column] == base[row]. Identical rows
+# share one offset; distinct rows never do. Empty rows get an offset past the end of the table.
+def _pack_rows(rows):
+    base = [0] * len(rows)
+    check = []
+    value = []
+    placed = {}  # row contents -> offset
+    used_offsets = set()
+    first_free = 0
+    empty_rows = []
+    for row_number in sorted(range(len(rows)), key=lambda number: -len(rows[number])):
+        columns = rows[row_number]
+        if not columns:
+            empty_rows.append(row_number)
+            continue
+        key = tuple(sorted(columns.items()))
+        if key in placed:
+            base[row_number] = placed[key]
+            continue
+        ordered = [column for column, _ in key]
+        lead, rest = ordered[0], ordered[1:]
+        size = len(check)
+        # only offsets that put the first column on a free slot are candidates; check.index()
+        # jumps from one free slot to the next
+        slot = max(first_free, lead)
+        while True:
+            if slot < size and check[slot] != -1:
+                try:
+                    slot = check.index(-1, slot)
+                except ValueError:
+                    slot = size
+            offset = slot - lead
+            if offset not in used_offsets and all(
+                    offset + column >= size or check[offset + column] == -1 for column in rest):
+                break
+            slot += 1
+        if offset + ordered[-1] >= size:
+            check.extend([-1] * (offset + ordered[-1] + 1 - size))
+            value.extend([0] * (offset + ordered[-1] + 1 - size))
+        for column, entry in key:
+            check[offset + column] = offset
+            value[offset + column] = entry
+        base[row_number] = placed[key] = offset
+        used_offsets.add(offset)
+        while first_free < len(check) and check[first_free] != -1:
+            first_free += 1
+    for row_number in empty_rows:
+        base[row_number] = len(check)
+    return base, check, value
+
+
+# Shift-reduce driver over packed tables.
+class LALRParser:
+    def __init__(self, tables):
+        self.symbols = tables['symbols']
+        self.ids = {symbol: symbol_id for symbol_id, symbol in enumerate(self.symbols)}
+        self.nonterminal_count = tables['nonterminal_count']
+        self.production_lhs = array('i', tables['production_lhs'])
+        self.production_lengths = array('i', tables['production_lengths'])
+        self.action_base = array('i', tables['action_base'])
+        self.action_check = array('i', tables['action_check'])
+        self.action_value = array('i', tables['action_value'])
+        self.action_default = array('i', tables['action_default'])
+        self.goto_base = array('i', tables['goto_base'])
+        self.goto_check = array('i', tables['goto_check'])
+        self.goto_value = array('i', tables['goto_value'])
+        self.conflicts = tables['conflicts']
+
+    # Terminal id of a lexer token: its type when that is a terminal of the grammar, otherwise
+    # its lexeme.
+    def terminal_id(self, token):
+        return terminal_id(self.ids, self.nonterminal_count, token)
+
+    # Builds the value of a reduced production; the default is a (nonterminal, *children) tuple
+    # with token lexemes as leaves.
+    def reduce(self, nonterminal, children):
+        return (nonterminal,) + tuple(children)
+
+    def parse(self, tokens):
+        action_base, action_check, action_value = self.action_base, self.action_check, self.action_value
+        action_default = self.action_default
+        goto_base, goto_check, goto_value = self.goto_base, self.goto_check, self.goto_value
+        production_lhs, production_lengths = self.production_lhs, self.production_lengths
+        nonterminal_count = self.nonterminal_count
+        end_id = len(self.symbols) - 1
+        check_size = len(action_check)
+
+        tokens = iter(tokens)
+        token = next(tokens, None)
+        lookahead = end_id if token is None else self.terminal_id(token)
+        states = [0]
+        values = []
+        while True:
+            state = states[-1]
+            base = action_base[state]
+            slot = base + lookahead - nonterminal_count
+            action = action_value[slot] if slot < check_size and action_check[slot] == base else action_default[state]
+            if action > 0:
+                states.append(action - 1)
+                values.append(token[1])
+                token = next(tokens, None)
+                lookahead = end_id if token is None else self.terminal_id(token)
+            elif action < -1:
+                number = -action - 1
+                length = production_lengths[number]
+                children = values[len(values) - length:]
+                if length:
+                    del states[-length:], values[-length:]
+                lhs = production_lhs[number]
+                slot = goto_base[states[-1]] + lhs
+                states.append(goto_value[slot])
+                values.append(self.reduce(self.symbols[lhs], children))
+            elif action == -1 and lookahead == end_id:
+                return values[-1]
+            else:
+                found = self.symbols[lookahead] if token is None else tuple(token)[:2]
+                raise ValueError(f"Syntax error at {found}")
+
+    # Parses the tokens of a file lexed with TokensAndLexem.lexer.
+    def parse_file(self, file_path):
+        from TokensAndLexem import lexer
+        return self.parse(chain.from_iterable(lexer(file_path)))
+
+
+# Returns an LALRParser for the grammar, loading its tables from the cache when the same grammar
+# was built before.
+def load_parser(grammar, start_symbol=None, cache_dir=None):
+    grammar = Grammar.of(grammar, start_symbol)
+    key = TableCache.spec_hash('lalr', GENERATOR_VERSION, AnalysisCache.grammar_key(grammar))
+    tables = TableCache.load('lalr', key, cache_dir)
+    if tables is None or tables.get('version') != GENERATOR_VERSION:
+        tables = build_tables(grammar)
+        TableCache.store('lalr', key, tables, cache_dir, AnalysisCache.MAX_ENTRIES)
+    return LALRParser(tables)
+
+
+if __name__ == "__main__":
+    from TokensAndLexem import iter_tokens
+
+    # Left-recursive expression grammar, not LL(1):
+    #   E -> E + T | T     T -> T * F | F     F -> ( E ) | n
+    grammar = {
+        'E': ['E+T', 'T'],
+        'T': ['T*F', 'F'],
+        'F': ['(E)', 'n'],
+    }
+    parser = load_parser(grammar, 'E')
+    print("Conflicts:", parser.conflicts)
+    print(parser.parse(iter_tokens(["n + n * (n + n)\n"])))
+
+    parser = load_parser(Grammar.from_text("""
+        Expr   -> Expr '+' Term | Expr '-' Term | Term
+        Term   -> Term '*' Factor | Term '/' Factor | Factor
+        Factor -> '(' Expr ')' | NUMBER | IDENTIFIER
+    """))
+    print(parser.parse(iter_tokens(["x - 2 * (y + 1)\n"])))
@@ -0,0 +1,114 @@
+from array import array
+
+from ComputeFirst import first_bitsets, first_of_sequence
+from ComputeFollow import follow_bitsets
+from Grammar import Grammar
+
+
+# LL(1) parse table for a Grammar (or a rules dict, see Grammar). Symbol ids are the grammar's:
+# nonterminals 0..N-1, then the terminals and END_MARKER. The table is one flat array indexed by
+#     nonterminal_id * terminal_count + (terminal_id - N)
+# holding a production number, or -1 for an error entry. first and follow, when given, are the
+# grammar's first_bitsets and follow_bitsets.
+class LL1Table:
+    def __init__(self, grammar, start_symbol=None, first=None, follow=None):
+        grammar = Grammar.of(grammar, start_symbol)
+        if first is None:
+            first = first_bitsets(grammar)
+        if follow is None:
+            follow = follow_bitsets(grammar, first)
+        self.grammar = grammar
+        self.start_symbol = grammar.start_symbol
+        self.symbols = grammar.symbols
+        self.ids = grammar.ids
+        self.nonterminal_count = grammar.nonterminal_count
+        self.terminal_count = grammar.terminal_count
+
+        self.productions = []  # production number -> (lhs id, rhs ids)
+        self.production_texts = []  # production number -> (lhs, tuple of symbol names)
+        self.table = array('i', [-1]) * (self.nonterminal_count * self.terminal_count)
+        self.conflicts = []  # (nonterminal, terminal, [productions as tuples of names])
+
+        for number in range(grammar.production_count):
+            lhs, rhs = grammar.production_lhs[number], tuple(grammar.rhs(number))
+            self.productions.append((lhs, rhs))
+            self.production_texts.append(grammar.production_text(number))
+            lookaheads, rhs_nullable = first_of_sequence(grammar, first, rhs)
+            if rhs_nullable:
+                lookaheads |= follow[lhs]
+            for bit in range(lookaheads.bit_length()):
+                if lookaheads >> bit & 1:
+                    self.set_entry(lhs, self.nonterminal_count + bit, number)
+
+    # Fills one table entry. A second production for the same entry is a conflict: it is
+    # recorded and the first production is kept.
+    def set_entry(self, nonterminal_id, terminal_id, number):
+        index = nonterminal_id * self.terminal_count + terminal_id - self.nonterminal_count
+        existing = self.table[index]
+        if existing == -1:
+            self.table[index] = number
+        elif existing != number:
+            nonterminal, terminal = self.symbols[nonterminal_id], self.symbols[terminal_id]
+            for conflict in self.conflicts:
+                if conflict[0] == nonterminal and conflict[1] == terminal:
+                    conflict[2].append(self.production_texts[number][1])
+                    break
+            else:
+                self.conflicts.append((nonterminal, terminal,
+                                       [self.production_texts[existing][1], self.production_texts[number][1]]))
+
+    def is_ll1(self):
+        return not self.conflicts
+
+    def terminal_id(self, token):
+        return self.grammar.terminal_id(token)
+
+    # Stack-based predictive parse of a token stream (tuples from TokensAndLexem or TokenStream
+    # views). Returns the productions of the leftmost derivation as (nonterminal, production).
+    def parse(self, tokens):
+        table = self.table
+        productions = self.productions
+        nonterminal_count = self.nonterminal_count
+        terminal_count = self.terminal_count
+        end_id = self.grammar.end_id
+
+        token_ids = (self.terminal_id(token) for token in tokens)
+        lookahead = next(token_ids, end_id)
+        stack = [end_id, self.grammar.start]
+        derivation = []
+        while stack:
+            top = stack.pop()
+            if top >= nonterminal_count:  # terminal: must match the input
+                if top != lookahead:
+                    raise ValueError(f"Expected {self.symbols[top]!r}, got {self.symbols[lookahead]!r}")
+                if top == end_id:
+                    break
+                lookahead = next(token_ids, end_id)
+                continue
+            number = table[top * terminal_count + lookahead - nonterminal_count]
+            if number < 0:
+                raise ValueError(f"Unexpected {self.symbols[lookahead]!r} while parsing {self.symbols[top]!r}")
+            derivation.append(number)
+            stack.extend(reversed(productions[number][1]))
+        return [self.production_texts[number] for number in derivation]
+
+
+if __name__ == "__main__":
+    from TokensAndLexem import iter_tokens
+
+    grammar = {
+        'S': ['bXY'],
+        'X': ['b', 'c'],
+        'Y': ['b', ''],
+    }
+    ll1_table = LL1Table(grammar, 'S')
+    print("Conflicts:", ll1_table.conflicts)
+    print("Derivation of 'b c b':", ll1_table.parse(iter_tokens(["b c b\n"])))
+    print("Derivation of 'b b':", ll1_table.parse(iter_tokens(["b b\n"])))
+
+    expression_table = LL1Table(Grammar.from_text("""
+        Expr   -> Term Rest
+        Rest   -> '+' Term Rest | '-' Term Rest |
+        Term   -> NUMBER | IDENTIFIER | '(' Expr ')'
+    """))
+    print("Derivation of 'x + (1 - y)':", expression_table.parse(iter_tokens(["x + (1 - y)\n"])))
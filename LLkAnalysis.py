@@ -0,0 +1,238 @@
+from Grammar import Grammar
+
+_EMPTY = frozenset()
+
+
+# FIRST_k and FOLLOW_k sets and the strong LL(k) check for a Grammar (or a rules dict, see
+# Grammar). A lookahead is a tuple of up to k terminal ids; one shorter than k is a whole string
+# (the empty tuple standing for the empty string), or in FOLLOW_k ends with END_MARKER.
+#
+# The sets grow quickly with k, so nothing is stored twice: every lookahead tuple is interned,
+# every distinct set is interned as one shared frozenset, and k-truncated concatenations are
+# cached per pair of sets. max_lookaheads caps the entries of all stored sets together, which is
+# what the memory goes to; past it the analysis stops with a ValueError instead of exhausting
+# memory.
+class LLkAnalysis:
+    def __init__(self, grammar, k, start_symbol=None, max_lookaheads=10_000_000):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.grammar = grammar = Grammar.of(grammar, start_symbol)
+        self.k = k
+        self.max_lookaheads = max_lookaheads
+        self.stored = 0  # entries of the interned sets
+        self.strings = {(): ()}  # interned lookaheads
+        self.sets = {_EMPTY: _EMPTY}  # interned sets
+        self.open_sets = set()  # interned sets with a lookahead shorter than k
+        self.intern_set([()])
+        self.concatenations = {}  # (left set, right set) -> set
+        self.truncations = {}  # (set, length) -> set
+
+        nonterminal_count = grammar.nonterminal_count
+        self.rhs = [tuple(grammar.rhs(number)) for number in range(grammar.production_count)]
+        self.terminal_sets = [None] * nonterminal_count + [
+            self.intern_set([self.intern((terminal,))]) for terminal in range(nonterminal_count, len(grammar.symbols))]
+        self.first = self._first_k()
+        self.follow = self._follow_k()
+
+    def intern(self, string):
+        interned = self.strings.get(string)
+        if interned is None:
+            interned = self.strings[string] = string
+        return interned
+
+    def intern_set(self, strings):
+        strings = frozenset(strings)
+        interned = self.sets.get(strings)
+        if interned is None:
+            self.stored += len(strings)
+            if self.stored > self.max_lookaheads:
+                raise ValueError(f"More than {self.max_lookaheads} lookaheads stored for k={self.k}")
+            interned = self.sets[strings] = strings
+            if any(len(string) < self.k for string in strings):
+                self.open_sets.add(strings)
+        return interned
+
+    # The distinct prefixes of a set's lookaheads, cut to length.
+    def truncate(self, strings, length):
+        key = (strings, length)
+        result = self.truncations.get(key)
+        if result is None:
+            result = self.truncations[key] = self.intern_set(self.intern(string[:length]) for string in strings)
+        return result
+
+    # {a + b truncated to k | a in left, b in right}; a lookahead already k long stays as it is,
+    # even when right is empty. Only the first k - len(a) symbols of b matter, so a is joined with
+    # the distinct prefixes of right of that length, which are far fewer than right itself.
+    def concatenate(self, left, right):
+        if left is _EMPTY:
+            return _EMPTY
+        key = (left, right)
+        result = self.concatenations.get(key)
+        if result is None:
+            k, intern = self.k, self.intern
+            strings = set()
+            for prefix in left:
+                if len(prefix) >= k:
+                    strings.add(prefix)
+                else:
+                    strings.update(intern(prefix + suffix) for suffix in self.truncate(right, k - len(prefix)))
+            result = self.concatenations[key] = self.intern_set(strings)
+        return result
+
+    def symbol_set(self, symbol, first):
+        return first[symbol] if symbol < self.grammar.nonterminal_count else self.terminal_sets[symbol]
+
+    # FIRST_k of a sequence of symbol ids.
+    def sequence_first(self, sequence, first=None):
+        first = self.first if first is None else first
+        result = self.sets[frozenset([()])]
+        for symbol in sequence:
+            result = self.concatenate(result, self.symbol_set(symbol, first))
+            if result not in self.open_sets:
+                break
+        return result
+
+    # Worklist fixpoint: a nonterminal is recomputed only when the FIRST_k of a symbol in one of
+    # its productions changed. The worklist starts in dependency order, so outside of cycles every
+    # set is computed once, from final inputs.
+    def _first_k(self):
+        grammar = self.grammar
+        nonterminal_count = grammar.nonterminal_count
+        first = [_EMPTY] * nonterminal_count
+        users = [set() for _ in range(nonterminal_count)]
+        for number, rhs in enumerate(self.rhs):
+            for symbol in rhs:
+                if symbol < nonterminal_count:
+                    users[symbol].add(grammar.production_lhs[number])
+        worklist = _dependency_order(users)
+        queued = set(worklist)
+        while worklist:
+            nonterminal = worklist.pop()
+            queued.discard(nonterminal)
+            strings = set()
+            for number in grammar.productions_of(nonterminal):
+                strings |= self.sequence_first(self.rhs[number], first)
+            result = self.intern_set(strings)
+            if result is not first[nonterminal]:
+                first[nonterminal] = result
+                for user in users[nonterminal]:
+                    if user not in queued:
+                        queued.add(user)
+                        worklist.append(user)
+        return first
+
+    # FOLLOW_k(B) is the union of FIRST_k(beta) . FOLLOW_k(A) over the occurrences A -> alpha B beta,
+    # with (END_MARKER,) in FOLLOW_k(start). FIRST_k(beta) is fixed, so each occurrence is one
+    # concatenation redone when FOLLOW_k(A) changes.
+    def _follow_k(self):
+        grammar = self.grammar
+        nonterminal_count = grammar.nonterminal_count
+        occurrences = [[] for _ in range(nonterminal_count)]  # B -> [(A, FIRST_k(beta))]
+        users = [set() for _ in range(nonterminal_count)]  # A -> {B with an occurrence in A}
+        for number, rhs in enumerate(self.rhs):
+            lhs = grammar.production_lhs[number]
+            for position, symbol in enumerate(rhs):
+                if symbol < nonterminal_count:
+                    occurrences[symbol].append((lhs, self.sequence_first(rhs[position + 1:])))
+                    users[lhs].add(symbol)
+        start_set = self.intern_set([self.intern((grammar.end_id,))])
+        follow = [_EMPTY] * nonterminal_count
+        worklist = _dependency_order(users)
+        queued = set(worklist)
+        while worklist:
+            nonterminal = worklist.pop()
+            queued.discard(nonterminal)
+            strings = set(start_set) if nonterminal == grammar.start else set()
+            for owner, after in occurrences[nonterminal]:
+                strings |= self.concatenate(after, follow[owner])
+            result = self.intern_set(strings)
+            if result is not follow[nonterminal]:
+                follow[nonterminal] = result
+                for user in users[nonterminal]:
+                    if user not in queued:
+                        queued.add(user)
+                        worklist.append(user)
+        return follow
+
+    # Lookaheads that select a production: FIRST_k(rhs) . FOLLOW_k(lhs).
+    def production_lookaheads(self, number):
+        return self.concatenate(self.sequence_first(self.rhs[number]), self.follow[self.grammar.production_lhs[number]])
+
+    # Pairs of productions of one nonterminal that share a lookahead, as
+    # (nonterminal, production, production, sorted shared lookaheads), names instead of ids.
+    def conflicts(self):
+        grammar = self.grammar
+        conflicts = []
+        for nonterminal in range(grammar.nonterminal_count):
+            numbers = list(grammar.productions_of(nonterminal))
+            lookaheads = [self.production_lookaheads(number) for number in numbers]
+            for left in range(len(numbers)):
+                for right in range(left + 1, len(numbers)):
+                    shared = lookaheads[left] & lookaheads[right]
+                    if shared:
+                        conflicts.append((grammar.symbols[nonterminal], grammar.production_text(numbers[left])[1],
+                                          grammar.production_text(numbers[right])[1], sorted(self.names(shared))))
+        return conflicts
+
+    def is_llk(self):
+        return not self.conflicts()
+
+    def names(self, strings):
+        symbols = self.grammar.symbols
+        return {tuple(symbols[symbol] for symbol in string) for string in strings}
+
+
+# Nodes 0..n-1 as a worklist (popped from the end) in which a node comes after every node it
+# depends on, outside of cycles. users[x] are the nodes that depend on x; the order is a
+# depth-first postorder over the reversed edges, built without recursion.
+def _dependency_order(users):
+    depends = [[] for _ in users]
+    for node, node_users in enumerate(users):
+        for user in node_users:
+            depends[user].append(node)
+    order = []
+    visited = bytearray(len(users))
+    for root in range(len(users)):
+        if visited[root]:
+            continue
+        visited[root] = 1
+        stack = [(root, iter(depends[root]))]
+        while stack:
+            node, pending = stack[-1]
+            for dependency in pending:
+                if not visited[dependency]:
+                    visited[dependency] = 1
+                    stack.append((dependency, iter(depends[dependency])))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+    order.reverse()
+    return order
+
+
+# {nonterminal: set of lookahead tuples of terminal names}; the empty tuple marks a nonterminal
+# that derives the empty string.
+def compute_first_k(grammar, k, start_symbol=None, max_lookaheads=10_000_000):
+    analysis = LLkAnalysis(grammar, k, start_symbol, max_lookaheads)
+    symbols = analysis.grammar.symbols
+    return {symbols[nonterminal]: analysis.names(strings) for nonterminal, strings in enumerate(analysis.first)}
+
+
+def compute_follow_k(grammar, k, start_symbol=None, max_lookaheads=10_000_000):
+    analysis = LLkAnalysis(grammar, k, start_symbol, max_lookaheads)
+    symbols = analysis.grammar.symbols
+    return {symbols[nonterminal]: frozenset(analysis.names(strings))
+            for nonterminal, strings in enumerate(analysis.follow)}
+
+
+if __name__ == "__main__":
+    # Not LL(1): both Statement alternatives start with IDENTIFIER. Two tokens tell them apart.
+    grammar = Grammar.from_text("""
+        Statement -> IDENTIFIER '=' Expr | IDENTIFIER '(' Expr ')'
+        Expr      -> NUMBER | IDENTIFIER
+    """)
+    for k in (1, 2):
+        analysis = LLkAnalysis(grammar, k)
+        print(f"k={k}: FIRST_k(Statement) = {sorted(analysis.names(analysis.first[0]))}")
+        print(f"     conflicts: {analysis.conflicts()}")
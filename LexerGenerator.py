@@ -0,0 +1,501 @@
+import re
+import sys
+from array import array
+from bisect import bisect_right
+
+import TableCache
+from TokensAndLexem import TOKEN_TYPES
+
+# Bump when the table layout or the construction changes, so old cache entries are not reused.
+GENERATOR_VERSION = 1
+
+MAX_CODE_POINT = sys.maxunicode
+
+
+# ---------------------------------------------------------------------------
+# Character sets: sorted lists of disjoint (low, high) code point ranges, both ends included.
+
+def _normalize(ranges):
+    merged = []
+    for low, high in sorted(ranges):
+        if merged and low <= merged[-1][1] + 1:
+            if high > merged[-1][1]:
+                merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+
+def _complement(ranges):
+    result = []
+    previous = 0
+    for low, high in ranges:
+        if low > previous:
+            result.append((previous, low - 1))
+        previous = high + 1
+    if previous <= MAX_CODE_POINT:
+        result.append((previous, MAX_CODE_POINT))
+    return result
+
+
+_CLASS_ESCAPES = 'dsw'
+_class_escape_ranges = {}
+
+
+# Ranges of the code points \d, \s or \w matches. They are read off the runs `re` itself finds
+# in a string of every code point, so the classes mean exactly what they mean in `re` string
+# patterns, and the walk over all of Unicode runs inside the regex engine instead of calling a
+# Python predicate per code point. The string is built once, for the three escapes together.
+def _class_escape(letter):
+    if not _class_escape_ranges:
+        every_code_point = array('I', range(MAX_CODE_POINT + 1)).tobytes().decode(
+            'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be', 'surrogatepass')
+        for escape in _CLASS_ESCAPES:
+            _class_escape_ranges[escape] = [(match.start(), match.end() - 1)
+                                            for match in re.finditer('\\' + escape + '+', every_code_point)]
+    return _class_escape_ranges[letter]
+
+
+_LITERAL_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+# ---------------------------------------------------------------------------
+# Regex parser. Supports the syntax the TOKEN_TYPES lists use: literals and escapes, [...] classes
+# with ranges and negation, ., \d \s \w and their negations, groups ((...), (?:...), (?P<n>...)),
+# | and the quantifiers * + ? {m} {m,} {m,n}, each optionally lazy.
+# The result is a tree of tuples:
+#   ('set', ranges) ('cat', [nodes]) ('alt', [nodes]) ('repeat', node, minimum, maximum_or_None)
+
+class _RegexParser:
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.position = 0
+        self.lazy = False  # set when any quantifier is lazy
+
+    def error(self, message):
+        return ValueError(f"{message} at position {self.position} in pattern {self.pattern!r}")
+
+    def peek(self):
+        return self.pattern[self.position] if self.position < len(self.pattern) else None
+
+    def take(self):
+        char = self.peek()
+        if char is None:
+            raise self.error("Unexpected end of pattern")
+        self.position += 1
+        return char
+
+    def parse(self):
+        node = self.alternation()
+        if self.peek() is not None:
+            raise self.error(f"Unexpected {self.peek()!r}")
+        return node
+
+    def alternation(self):
+        options = [self.concatenation()]
+        while self.peek() == '|':
+            self.take()
+            options.append(self.concatenation())
+        return options[0] if len(options) == 1 else ('alt', options)
+
+    def concatenation(self):
+        items = []
+        while self.peek() not in (None, '|', ')'):
+            items.append(self.quantified())
+        return items[0] if len(items) == 1 else ('cat', items)
+
+    def quantified(self):
+        node = self.atom()
+        while self.peek() in ('*', '+', '?', '{'):
+            char = self.take()
+            if char == '*':
+                minimum, maximum = 0, None
+            elif char == '+':
+                minimum, maximum = 1, None
+            elif char == '?':
+                minimum, maximum = 0, 1
+            else:
+                minimum, maximum = self.counted()
+            if self.peek() == '?':
+                self.take()
+                self.lazy = True
+            node = ('repeat', node, minimum, maximum)
+        return node
+
+    def counted(self):
+        end = self.pattern.find('}', self.position)
+        if end == -1:
+            raise self.error("Unterminated {")
+        body = self.pattern[self.position:end]
+        self.position = end + 1
+        low, comma, high = body.partition(',')
+        try:
+            minimum = int(low)
+            maximum = (int(high) if high else None) if comma else minimum
+        except ValueError:
+            raise self.error(f"Bad repeat count {{{body}}}") from None
+        return minimum, maximum
+
+    def atom(self):
+        char = self.take()
+        if char == '(':
+            if self.pattern.startswith('?:', self.position):
+                self.position += 2
+            elif self.pattern.startswith('?P<', self.position):
+                self.position = self.pattern.index('>', self.position) + 1
+            elif self.peek() == '?':
+                raise self.error("Unsupported group type")
+            node = self.alternation()
+            if self.take() != ')':
+                raise self.error("Expected )")
+            return node
+        if char == '[':
+            return ('set', self.character_class())
+        if char == '.':
+            return ('set', _complement([(10, 10)]))
+        if char == '\\':
+            return ('set', self.escape())
+        if char in '*+?{)':
+            raise self.error(f"Nothing to repeat before {char!r}")
+        if char in '^$':
+            raise self.error("Anchors are not supported")
+        return ('set', [(ord(char), ord(char))])
+
+    def escape(self):
+        char = self.take()
+        if char in _CLASS_ESCAPES:
+            return _class_escape(char)
+        if char.lower() in _CLASS_ESCAPES:
+            return _complement(_class_escape(char.lower()))
+        if char in _LITERAL_ESCAPES:
+            code = ord(_LITERAL_ESCAPES[char])
+            return [(code, code)]
+        if char.isalnum():
+            raise self.error(f"Unsupported escape \\{char}")
+        return [(ord(char), ord(char))]
+
+    def character_class(self):
+        negated = self.peek() == '^'
+        if negated:
+            self.take()
+        ranges = []
+        first = True
+        while first or self.peek() != ']':
+            first = False
+            char = self.take()
+            if char == '\\':
+                item = self.escape()
+            else:
+                item = [(ord(char), ord(char))]
+            if (self.peek() == '-' and len(item) == 1 and item[0][0] == item[0][1]
+                    and self.pattern[self.position + 1:self.position + 2] not in ('', ']')):
+                self.take()
+                high_char = self.take()
+                high = self.escape() if high_char == '\\' else [(ord(high_char), ord(high_char))]
+                item = [(item[0][0], high[0][1])]
+            ranges.extend(item)
+        self.take()
+        ranges = _normalize(ranges)
+        return _complement(ranges) if negated else ranges
+
+
+# ---------------------------------------------------------------------------
+# Thompson NFA for all token types together. State 0 is the shared start state.
+
+class _NFA:
+    def __init__(self):
+        self.epsilon = [[]]
+        self.edges = [[]]  # (set_id, target)
+        self.sets = []  # set_id -> ranges
+        self.set_ids = {}
+        self.owner = [-1]  # token index each state belongs to
+        self.accepts = {}  # accept state -> token index
+        self.token = -1
+
+    def new_state(self):
+        self.epsilon.append([])
+        self.edges.append([])
+        self.owner.append(self.token)
+        return len(self.epsilon) - 1
+
+    def set_id(self, ranges):
+        key = tuple(ranges)
+        if key not in self.set_ids:
+            self.set_ids[key] = len(self.sets)
+            self.sets.append(ranges)
+        return self.set_ids[key]
+
+    # Returns (start, end) of a fragment that matches node.
+    def build(self, node):
+        kind = node[0]
+        if kind == 'set':
+            start, end = self.new_state(), self.new_state()
+            self.edges[start].append((self.set_id(node[1]), end))
+            return start, end
+        if kind == 'cat':
+            start, end = self.build(node[1][0])
+            for item in node[1][1:]:
+                item_start, item_end = self.build(item)
+                self.epsilon[end].append(item_start)
+                end = item_end
+            return start, end
+        if kind == 'alt':
+            start, end = self.new_state(), self.new_state()
+            for option in node[1]:
+                option_start, option_end = self.build(option)
+                self.epsilon[start].append(option_start)
+                self.epsilon[option_end].append(end)
+            return start, end
+        _, item, minimum, maximum = node
+        start = end = self.new_state()
+        for _ in range(minimum):
+            item_start, item_end = self.build(item)
+            self.epsilon[end].append(item_start)
+            end = item_end
+        if maximum is None:
+            item_start, item_end = self.build(item)
+            self.epsilon[end].append(item_start)
+            self.epsilon[item_end].append(item_start)
+            loop_end = self.new_state()
+            self.epsilon[end].append(loop_end)
+            self.epsilon[item_end].append(loop_end)
+            return start, loop_end
+        optional_end = self.new_state()
+        for _ in range(maximum - minimum):
+            self.epsilon[end].append(optional_end)
+            item_start, item_end = self.build(item)
+            self.epsilon[end].append(item_start)
+            end = item_end
+        self.epsilon[end].append(optional_end)
+        return start, optional_end
+
+    def add_token(self, token_index, pattern):
+        parser = _RegexParser(pattern)
+        node = parser.parse()
+        self.token = token_index
+        start, end = self.build(node)
+        self.epsilon[0].append(start)
+        self.accepts[end] = token_index
+        return parser.lazy
+
+
+# ---------------------------------------------------------------------------
+# Alphabet compression: code points that every character set treats alike share one class.
+# boundaries[i] is the first code point of elementary interval i, interval_classes[i] its class.
+
+def _character_classes(sets):
+    points = {0}
+    for ranges in sets:
+        for low, high in ranges:
+            points.add(low)
+            if high < MAX_CODE_POINT:
+                points.add(high + 1)
+    boundaries = sorted(points)
+    membership = [0] * len(boundaries)  # bitmask of the sets containing each interval
+    for set_id, ranges in enumerate(sets):
+        bit = 1 << set_id
+        for low, high in ranges:
+            for index in range(bisect_right(boundaries, low) - 1, bisect_right(boundaries, high)):
+                membership[index] |= bit
+    class_of_signature = {}
+    interval_classes = []
+    for signature in membership:
+        interval_classes.append(class_of_signature.setdefault(signature, len(class_of_signature)))
+    # drop boundaries between neighbours of the same class
+    compact_boundaries, compact_classes = [], []
+    for boundary, class_id in zip(boundaries, interval_classes):
+        if not compact_classes or compact_classes[-1] != class_id:
+            compact_boundaries.append(boundary)
+            compact_classes.append(class_id)
+    set_classes = [set() for _ in sets]
+    for signature, class_id in class_of_signature.items():
+        for set_id in range(len(sets)):
+            if signature >> set_id & 1:
+                set_classes[set_id].add(class_id)
+    return compact_boundaries, compact_classes, len(class_of_signature), set_classes
+
+
+# ---------------------------------------------------------------------------
+# Subset construction and minimization.
+
+def _closure(nfa, states):
+    stack = list(states)
+    seen = set(states)
+    while stack:
+        for target in nfa.epsilon[stack.pop()]:
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+
+# Priority by order: a DFA state accepts the earliest token type among its NFA accept states.
+# A token whose pattern is lazy (like \".*?\") stops growing once it has matched, so that
+# token's other NFA states are dropped from any set holding its accept state.
+def _finish_state(nfa, states, lazy_tokens):
+    accepted = [nfa.accepts[state] for state in states if state in nfa.accepts]
+    for token in accepted:
+        if token in lazy_tokens:
+            states = {state for state in states if nfa.owner[state] != token or state in nfa.accepts}
+    return frozenset(states), min(accepted) if accepted else -1
+
+
+def _subset_construction(nfa, class_count, set_classes, lazy_tokens):
+    start, start_accept = _finish_state(nfa, _closure(nfa, [0]), lazy_tokens)
+    state_ids = {start: 0}
+    states = [start]
+    accept = [start_accept]
+    transitions = []
+    index = 0
+    while index < len(states):
+        moves = {}
+        for nfa_state in states[index]:
+            for set_id, target in nfa.edges[nfa_state]:
+                for class_id in set_classes[set_id]:
+                    moves.setdefault(class_id, set()).add(target)
+        row = [-1] * class_count
+        for class_id, targets in moves.items():
+            target_set, target_accept = _finish_state(nfa, _closure(nfa, targets), lazy_tokens)
+            if target_set not in state_ids:
+                state_ids[target_set] = len(states)
+                states.append(target_set)
+                accept.append(target_accept)
+            row[class_id] = state_ids[target_set]
+        transitions.append(row)
+        index += 1
+    return transitions, accept
+
+
+# Moore partition refinement: start from blocks of states accepting the same token and split
+# blocks until all states in a block go to the same blocks on every class.
+def _minimize(transitions, accept):
+    block_of = list(accept)
+    block_count = len(set(block_of))
+    while True:
+        signatures = {}
+        new_block_of = []
+        for state, row in enumerate(transitions):
+            signature = (block_of[state], tuple(block_of[target] if target >= 0 else -2 for target in row))
+            new_block_of.append(signatures.setdefault(signature, len(signatures)))
+        if len(signatures) == block_count:
+            break
+        block_of, block_count = new_block_of, len(signatures)
+    # renumber so the start state's block is 0
+    order = {}
+    for state in range(len(transitions)):
+        order.setdefault(new_block_of[state], len(order))
+    class_count = len(transitions[0]) if transitions else 0
+    table = [-1] * (len(order) * class_count)
+    minimized_accept = [-1] * len(order)
+    for state, row in enumerate(transitions):
+        block = order[new_block_of[state]]
+        minimized_accept[block] = accept[state]
+        for class_id, target in enumerate(row):
+            if target >= 0:
+                table[block * class_count + class_id] = order[new_block_of[target]]
+    return table, minimized_accept
+
+
+# Builds the minimized DFA tables for a TOKEN_TYPES-style list of (name, pattern).
+def build_tables(token_types):
+    nfa = _NFA()
+    lazy_tokens = set()
+    for token_index, (_, pattern) in enumerate(token_types):
+        if nfa.add_token(token_index, pattern):
+            lazy_tokens.add(token_index)
+    boundaries, interval_classes, class_count, set_classes = _character_classes(nfa.sets)
+    transitions, accept = _subset_construction(nfa, class_count, set_classes, lazy_tokens)
+    table, accept = _minimize(transitions, accept)
+    return {
+        'version': GENERATOR_VERSION,
+        'names': [name for name, _ in token_types],
+        'boundaries': boundaries,
+        'interval_classes': interval_classes,
+        'class_count': class_count,
+        'table': table,
+        'accept': accept,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Table-driven scanner. Every character costs one class lookup and one table lookup, whatever
+# the number of token types. Tokens follow maximal munch: the scanner runs until the DFA has no
+# move and returns the longest accepted prefix. In CPython this is not faster than the `re`
+# master regex of TokensAndLexem: the per-character loop runs as bytecode while `re` scans in C,
+# and it comes out somewhat slower (Benchmark/LexerGeneratorBenchmark.py). What the tables give
+# is a cost per character that does not grow with the number of token types, and a format a
+# compiled scanner could load.
+
+class DFALexer:
+    def __init__(self, tables):
+        self.names = tables['names']
+        self.class_count = tables['class_count']
+        self.table = array('i', tables['table'])
+        self.accept = array('i', tables['accept'])
+        self.boundaries = tables['boundaries']
+        self.interval_classes = tables['interval_classes']
+        # code point -> class for ASCII, the common case, without a bisect
+        self.ascii_classes = [self.class_of(code) for code in range(128)]
+        self.whitespace = self.names.index('WHITESPACE') if 'WHITESPACE' in self.names else -1
+
+    def class_of(self, code):
+        return self.interval_classes[bisect_right(self.boundaries, code) - 1]
+
+    # Yields (token_index, start, end) for every token of text, whitespace included.
+    def scan(self, text, position=0):
+        table = self.table
+        accept = self.accept
+        class_count = self.class_count
+        ascii_classes = self.ascii_classes
+        class_of = self.class_of
+        end = len(text)
+        while position < end:
+            state = 0
+            token = -1
+            token_end = position
+            index = position
+            while index < end:
+                code = ord(text[index])
+                state = table[state * class_count + (ascii_classes[code] if code < 128 else class_of(code))]
+                if state < 0:
+                    break
+                index += 1
+                if accept[state] >= 0:
+                    token = accept[state]
+                    token_end = index
+            if token < 0:
+                raise ValueError(f'Invalid token at offset {position}: {text[position:position + 20]!r}')
+            yield token, position, token_end
+            position = token_end
+
+    # Same output as TokensAndLexem.tokenize_line.
+    def tokenize_line(self, line, line_number):
+        names = self.names
+        whitespace = self.whitespace
+        return [(names[token], line[start:end], f"Line : {line_number}")
+                for token, start, end in self.scan(line) if token != whitespace]
+
+    # Same output as TokensAndLexem.lexer.
+    def lexer(self, file_path):
+        with open(file_path, 'r') as file:
+            return [self.tokenize_line(line.strip(), line_number) for line_number, line in enumerate(file, 1)]
+
+
+# Returns a DFALexer for token_types, reading the tables from the cache when the same spec was
+# built before and building and storing them otherwise.
+def load_lexer(token_types=TOKEN_TYPES, cache_dir=None):
+    key = TableCache.spec_hash('dfa-lexer', GENERATOR_VERSION, [list(item) for item in token_types])
+    tables = TableCache.load('lexer', key, cache_dir)
+    if tables is None or tables.get('version') != GENERATOR_VERSION:
+        tables = build_tables(token_types)
+        TableCache.store('lexer', key, tables, cache_dir)
+    return DFALexer(tables)
+
+
+if __name__ == "__main__":
+    dfa_lexer = load_lexer()
+    print(f"{len(dfa_lexer.accept)} states, {dfa_lexer.class_count} character classes")
+    for line_number, line_tokens in enumerate(dfa_lexer.lexer("text.txt"), 1):
+        print(f"\nTokens For Line {line_number} Are :")
+        for token in line_tokens:
+            print(token)
@@ -0,0 +1,99 @@
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+
+from TokensAndLexem import TOKEN_TYPES
+
+# Token types by id: the id of a token is the index of its type in TOKEN_TYPES.
+TOKEN_NAMES = [name for name, _ in TOKEN_TYPES]
+WHITESPACE_ID = TOKEN_NAMES.index('WHITESPACE')
+
+# The same master alternation as TokensAndLexem.MASTER_REGEX, compiled as a bytes pattern so it
+# can run straight over the memory map without decoding. Byte patterns are ASCII only: \d and \s
+# match ASCII digits/whitespace and a non-ASCII character comes out as one UNKNOWN token per byte.
+MASTER_BYTES_REGEX = re.compile(b'|'.join(
+    b'(?P<' + name.encode() + b'>' + pattern.encode() + b')' for name, pattern in TOKEN_TYPES
+))
+
+# match.lastindex -> token id. lastindex counts every group, including the ones nested inside
+# a token pattern (like the fraction in NUMBER), so map each named group's index to its type.
+GROUP_TO_ID = [None] * (MASTER_BYTES_REGEX.groups + 1)
+for _name, _index in MASTER_BYTES_REGEX.groupindex.items():
+    GROUP_TO_ID[_index] = TOKEN_NAMES.index(_name)
+
+
+# Lexes a file through a read-only memory map. Tokens are (type_id, start, end) byte offsets;
+# the lexeme text and the line/column of a token are only built when asked for.
+class MappedSource:
+    def __init__(self, file_path):
+        self.file = open(file_path, 'rb')
+        try:
+            # mmap refuses empty files, an empty bytes object scans the same way
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.buffer = b''
+        self.line_starts = None  # built by line_index() on first use
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Yields (type_id, start, end) for every non-whitespace token, scanning the whole buffer at once.
+    # Newlines are whitespace and no token pattern crosses a line, so this gives the same tokens as
+    # stripping and lexing every line on its own.
+    def tokens(self):
+        buffer = self.buffer
+        match = MASTER_BYTES_REGEX.match
+        group_to_id = GROUP_TO_ID
+        whitespace = WHITESPACE_ID
+        position = 0
+        end = len(buffer)
+        while position < end:
+            regex_match = match(buffer, position)
+            if regex_match is None:
+                line, column = self.line_column(position)
+                raise ValueError(f'Invalid token at line {line}, column {column}')
+            type_id = group_to_id[regex_match.lastindex]
+            position = regex_match.end()
+            if type_id != whitespace:
+                yield (type_id, regex_match.start(), position)
+
+    def lexeme(self, start, end):
+        return self.buffer[start:end].decode()
+
+    # Offsets where every line starts, found with find() so the scan runs in C.
+    def line_index(self):
+        if self.line_starts is None:
+            starts = array('q', [0])
+            buffer = self.buffer
+            position = buffer.find(b'\n')
+            while position != -1:
+                starts.append(position + 1)
+                position = buffer.find(b'\n', position + 1)
+            self.line_starts = starts
+        return self.line_starts
+
+    # 1-based line and column of a byte offset.
+    def line_column(self, offset):
+        starts = self.line_index()
+        line = bisect_right(starts, offset)
+        return line, offset - starts[line - 1] + 1
+
+    # The token in the same shape TokensAndLexem.lexer produces, for printing and debugging.
+    def token_tuple(self, token):
+        type_id, start, end = token
+        return (TOKEN_NAMES[type_id], self.lexeme(start, end), f"Line : {self.line_column(start)[0]}")
+
+
+if __name__ == "__main__":
+    with MappedSource("text.txt") as source:
+        for token in source.tokens():
+            print(token, source.token_tuple(token))
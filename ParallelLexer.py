@@ -0,0 +1,137 @@
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from MappedLexer import GROUP_TO_ID, MASTER_BYTES_REGEX, TOKEN_NAMES, WHITESPACE_ID
+from TokenStream import TokenStream
+
+# Files smaller than this are not worth splitting.
+MIN_CHUNK_SIZE = 1 << 20
+
+
+def _open_buffer(file_path):
+    with open(file_path, 'rb') as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return b''
+
+
+# Offsets wider than int32 are needed for files over 2 GB.
+def _offset_code(size):
+    return 'i' if size < 2**31 else 'q'
+
+
+# Runs in a worker process. Lexes buffer[start:end] of the file and sends back the four
+# TokenStream columns. Arrays pickle as their raw bytes, so a chunk with millions of tokens
+# travels as four flat buffers instead of millions of tuples.
+# start always sits right after a newline, first_line is the line number there.
+def _lex_chunk(file_path, start, end, first_line):
+    buffer = _open_buffer(file_path)
+    try:
+        offset_code = _offset_code(len(buffer))
+        types, starts, ends, lines = array('B'), array(offset_code), array(offset_code), array('i')
+        match = MASTER_BYTES_REGEX.match
+        group_to_id = GROUP_TO_ID
+        whitespace = WHITESPACE_ID
+        line_number = first_line
+        position = start
+        while position < end:
+            regex_match = match(buffer, position, end)
+            if regex_match is None:
+                raise ValueError(f'Invalid token at line {line_number}')
+            type_id = group_to_id[regex_match.lastindex]
+            token_end = regex_match.end()
+            if type_id == whitespace:
+                line_number += regex_match.group().count(b'\n')
+            else:
+                types.append(type_id)
+                starts.append(position)
+                ends.append(token_end)
+                lines.append(line_number)
+            position = token_end
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+    return types, starts, ends, lines
+
+
+# mmap has no count(), so count newlines over bounded slices of the map.
+def _count_newlines(buffer, start, end, step=1 << 24):
+    count = 0
+    for position in range(start, end, step):
+        count += buffer[position:min(position + step, end)].count(b'\n')
+    return count
+
+
+# Cuts [0, len(buffer)) into about `parts` pieces, each ending just after a newline, and pairs
+# every piece with the line number it starts on. Counting newlines runs in C,
+# which is far cheaper than lexing, so the main process can afford it up front.
+def split_at_newlines(buffer, parts, min_chunk_size=MIN_CHUNK_SIZE):
+    size = len(buffer)
+    chunk_size = max(min_chunk_size, -(-size // max(parts, 1)))
+    chunks = []
+    start = 0
+    first_line = 1
+    while start < size:
+        end = buffer.find(b'\n', min(start + chunk_size, size) - 1)
+        end = size if end == -1 else end + 1
+        chunks.append((start, end, first_line))
+        first_line += _count_newlines(buffer, start, end)
+        start = end
+    return chunks
+
+
+# Lexes one large file on several processes. The result is a single TokenStream whose offsets
+# point into a memory map of the file and whose line numbers are global, in file order. The
+# stream owns the map: close it, or use it in a with block, when done.
+def lex_file_parallel(file_path, workers=None, min_chunk_size=MIN_CHUNK_SIZE):
+    workers = workers or os.cpu_count() or 1
+    buffer = _open_buffer(file_path)
+    offset_code = _offset_code(len(buffer))
+    stream = TokenStream(buffer, TOKEN_NAMES, array('B'), array(offset_code), array(offset_code), array('i'))
+    try:
+        chunks = split_at_newlines(buffer, workers, min_chunk_size)
+        if len(chunks) <= 1:
+            results = [_lex_chunk(file_path, *chunk) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_lex_chunk, file_path, *chunk) for chunk in chunks]
+                results = [future.result() for future in futures]  # in file order
+    except BaseException:
+        stream.close()
+        raise
+    for types, starts, ends, lines in results:
+        stream.types.extend(types)
+        stream.starts.extend(starts)
+        stream.ends.extend(ends)
+        stream.lines.extend(lines)
+    stream.stop = len(stream.types)
+    return stream
+
+
+# Lexes a batch of files, one file per task, and returns their TokenStreams in the same order.
+# Each stream owns a memory map of its file; close them when done. If opening one fails, the
+# ones already opened are closed.
+def lex_files_parallel(file_paths, workers=None):
+    file_paths = list(file_paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_lex_chunk, file_path, 0, os.path.getsize(file_path), 1)
+                   for file_path in file_paths]
+        results = [future.result() for future in futures]
+    streams = []
+    try:
+        for file_path, columns in zip(file_paths, results):
+            streams.append(TokenStream(_open_buffer(file_path), TOKEN_NAMES, *columns))
+    except BaseException:
+        for stream in streams:
+            stream.close()
+        raise
+    return streams
+
+
+if __name__ == "__main__":
+    with lex_file_parallel("text.txt") as stream:
+        for token in stream:
+            print(token)
@@ -94,15 +94,14 @@ class Parser:
 
 
 if __name__ == "__main__":
+    from ProgramParser import ProgramParser
+    from TokenStream import TokenStream
+
     file_path = 'text1.txt'
-    tokens = lexer(file_path)
     try:
-        for i, line_tokens in enumerate(tokens, start=1):
-            parser = Parser(line_tokens)
-            parse_tree = parser.parse()
-            print(parse_tree)
-            # print(f"\nTokens For Line {i} Are : ")
-            # for token in line_tokens:
-            #     print(token)
-    except:
-        raise FileNotFoundError(f"File Not Fount At Path : {file_path}")
\ No newline at end of file
+        stream = TokenStream.from_file(file_path, TOKEN_TYPES)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File Not Fount At Path : {file_path}")
+    # One parser over the whole file instead of a Parser per line
+    for statement in ProgramParser(stream).parse():
+        print(statement.tree)
@@ -0,0 +1,152 @@
+from collections import namedtuple
+
+from TokenStream import TokenStream
+
+# One parsed statement: the same tree ParseTree.Parser builds, e.g. ('=', 'x', ('+', '1', '2')),
+# and the lines it spans in the source.
+Statement = namedtuple('Statement', ['tree', 'first_line', 'last_line'])
+
+
+# Parses a whole TokenStream in one pass into a list of Statements, instead of building one
+# Parser per line. Statements are separated by ';' or by a line break. An expression carries on
+# to the next line when the line ends inside parentheses or with an operator still waiting for
+# its right operand, e.g.
+#     total = (a +
+#              b) * 2
+# Works on streams lexed with TokensAndLexem.TOKEN_TYPES (IDENTIFIER) or ParseTree's (VARIABLE).
+# It is not faster than ParseTree.Parser at parsing alone (see Benchmark/ParserBenchmark.py): the
+# lexemes are sliced out of the source here instead of coming prebuilt in tuples.
+# With a symbol table, every assigned name is also inserted into it on its first assignment, as
+# the symbol-table scripts need; the key is the name's Interner id when the stream has them.
+class ProgramParser:
+    def __init__(self, stream, table=None):
+        self.stream = stream
+        self.table = table
+        self.symbols = stream.symbols
+        self.types = stream.types
+        self.lines = stream.lines
+        self.starts = stream.starts
+        self.ends = stream.ends
+        self.source = stream.source
+        self.text_source = isinstance(stream.source, str)  # bytes and mmap sources need decoding
+        self.current_token_index = stream.first
+        self.stop = stream.stop
+        self.depth = 0  # open parentheses in the current statement
+        codes = {name: code for code, name in enumerate(stream.names)}
+        self.NAME = {codes[name] for name in ('IDENTIFIER', 'VARIABLE') if name in codes}
+        self.OPERAND = self.NAME | {codes[name] for name in ('NUMBER', 'STRING') if name in codes}
+        self.ASSIGN = codes.get('ASSIGN')
+        self.LPAREN = codes.get('LPAREN')
+        self.RPAREN = codes.get('RPAREN')
+        self.SEMICOLON = codes.get('SEMICOLON')
+        self.TERM_OPERATORS = {codes[name] for name in ('MULTIPLY', 'DIVIDE') if name in codes}
+        self.EXPRESSION_OPERATORS = {codes[name] for name in ('PLUS', 'MINUS') if name in codes}
+
+    def parse(self):
+        statements = []
+        while self.current_token_index < self.stop:
+            if self.types[self.current_token_index] == self.SEMICOLON:  # empty statement
+                self.current_token_index += 1
+                continue
+            first_line = self.lines[self.current_token_index]
+            tree = self.assignment()
+            last_line = self.lines[self.current_token_index - 1]
+            self.end_statement(last_line)
+            if self.table is not None:
+                self.declare(tree, first_line)
+            statements.append(Statement(tree, first_line, last_line))
+        return statements
+
+    # After a statement comes ';', a new line or the end of the input.
+    def end_statement(self, last_line):
+        index = self.current_token_index
+        if index >= self.stop:
+            return
+        if self.types[index] == self.SEMICOLON:
+            self.current_token_index += 1
+        elif self.lines[index] == last_line:
+            raise ValueError(f"Expected end of statement at line {last_line}, got {self.token(index)}")
+
+    # Inserts the assigned name with the datatype of its value, the right operand of the top
+    # operator: "float" if it has a '.', "int" if it is digits, "str" otherwise.
+    def declare(self, tree, line):
+        value = tree[2]
+        while not isinstance(value, str):
+            value = value[2]
+        datatype = "float" if "." in value else "int" if value.replace(".", "").isdigit() else "str"
+        key = tree[1] if self.symbols is None else self.symbols[self.target]
+        if not self.table.lookup(key):
+            self.table.insert(key, datatype, line)
+
+    def assignment(self):
+        self.depth = 0
+        self.target = self.current_token_index  # index of the assigned name
+        variable_name_token = self.consume(self.NAME)
+        self.consume({self.ASSIGN})
+        expression_value = self.expression()
+        return ("=", variable_name_token, expression_value)
+
+    def factor(self):
+        index = self.current_token_index
+        if index < self.stop and self.types[index] in self.OPERAND:  # fast path for leaves
+            self.current_token_index = index + 1
+            if self.text_source:
+                return self.source[self.starts[index]:self.ends[index]]
+            return self.lexeme(index)
+        self.consume({self.LPAREN})
+        self.depth += 1
+        expression_value = self.expression()
+        self.consume({self.RPAREN})
+        self.depth -= 1
+        return expression_value
+
+    # The operator loops below continue only while the next token is one of their operators and
+    # is on the same line as the token before it, or inside parentheses.
+    def term(self):
+        types, lines, stop, operators = self.types, self.lines, self.stop, self.TERM_OPERATORS
+        result = self.factor()
+        index = self.current_token_index
+        while (index < stop and types[index] in operators
+               and (self.depth or lines[index] == lines[index - 1])):
+            self.current_token_index = index + 1
+            result = (self.lexeme(index), result, self.factor())
+            index = self.current_token_index
+        return result
+
+    def expression(self):
+        types, lines, stop, operators = self.types, self.lines, self.stop, self.EXPRESSION_OPERATORS
+        result = self.term()
+        index = self.current_token_index
+        while (index < stop and types[index] in operators
+               and (self.depth or lines[index] == lines[index - 1])):
+            self.current_token_index = index + 1
+            result = (self.lexeme(index), result, self.term())
+            index = self.current_token_index
+        return result
+
+    def lexeme(self, index):
+        if self.text_source:
+            return self.source[self.starts[index]:self.ends[index]]
+        return bytes(self.source[self.starts[index]:self.ends[index]]).decode()
+
+    def token(self, index):
+        return (self.stream.names[self.types[index]], self.lexeme(index))
+
+    # Checks the current token's type code and returns its lexeme.
+    def consume(self, expected_types):
+        index = self.current_token_index
+        if index >= self.stop:
+            raise ValueError("Unexpected end of input")
+        if self.types[index] not in expected_types:
+            raise ValueError(f"Unexpected {self.token(index)} at line {self.lines[index]}")
+        self.current_token_index = index + 1
+        return self.lexeme(index)
+
+
+def parse_file(file_path):
+    return ProgramParser(TokenStream.from_file(file_path)).parse()
+
+
+if __name__ == "__main__":
+    for statement in parse_file("text1.txt"):
+        print(statement)
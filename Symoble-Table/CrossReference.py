@@ -0,0 +1,128 @@
+from array import array
+
+# Kinds of identifier occurrences. The first assignment to a name defines it; later ones
+# reassign it, and every other occurrence reads it.
+DEFINITION, ASSIGNMENT, USE = 0, 1, 2
+KIND_NAMES = ('definition', 'assignment', 'use')
+
+# Token types that are identifiers in the lexers of this directory and of TokensAndLexem.
+IDENTIFIER_TYPES = frozenset(('VARIABLE', 'IDENTIFIER'))
+
+
+# Cross-reference index: every occurrence of every identifier, recorded while the tokens are
+# produced so reports and "find references" never rescan the source. It is keyed on the ids of
+# an Interner, normally the one the lexer, parser and symbol tables share; occurrences of id i
+# are kept in three compact parallel arrays,
+#   lines[i]   - int32 line numbers
+#   columns[i] - int32 1-based columns
+#   kinds[i]   - one byte per occurrence, DEFINITION, ASSIGNMENT or USE
+# in source order (empty for ids interned elsewhere and never fed here). Feed tokens in order
+# with feed() and call finish() after the last one, or hand a whole TokenStream to
+# feed_stream(); an identifier is only classified once the token after it shows whether it is
+# assigned. Queries take a name or its id.
+class CrossReference:
+    def __init__(self, interner):
+        self.interner = interner  # an Interner.Interner
+        self.lines = []
+        self.columns = []
+        self.kinds = []
+        self.defined = bytearray()  # id -> 1 once the identifier has a definition
+        self._pending = None  # (id, line, column) of the last identifier fed
+
+    # Feeds one token. symbol is the token's Interner id when the lexer already has it; otherwise
+    # an identifier's value is interned here.
+    def feed(self, token_type, value, line, column, symbol=-1):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            self._record(pending, token_type == 'ASSIGN')
+        if token_type in IDENTIFIER_TYPES:
+            self._pending = (symbol if symbol >= 0 else self.interner.intern(value), line, column)
+
+    def finish(self):
+        if self._pending is not None:
+            self._record(self._pending, False)
+            self._pending = None
+
+    # Feeds every token of a TokenStream and finishes. The ids come from the stream's symbols
+    # column when it was lexed with this index's interner.
+    def feed_stream(self, stream):
+        for token in stream:
+            self.feed(token.type, token.value, token.line, token.column, token.symbol)
+        self.finish()
+
+    def _record(self, pending, assigned):
+        identifier, line, column = pending
+        while len(self.kinds) <= identifier:  # ids interned since the last occurrence
+            self.lines.append(array('i'))
+            self.columns.append(array('i'))
+            self.kinds.append(bytearray())
+            self.defined.append(0)
+        if not assigned:
+            kind = USE
+        elif self.defined[identifier]:
+            kind = ASSIGNMENT
+        else:
+            kind = DEFINITION
+            self.defined[identifier] = 1
+        self.lines[identifier].append(line)
+        self.columns[identifier].append(column)
+        self.kinds[identifier].append(kind)
+
+    # id of a name (or the id itself), -1 when it has no occurrences.
+    def _id(self, name):
+        identifier = name if isinstance(name, int) else self.interner.id_of(name)
+        return identifier if 0 <= identifier < len(self.kinds) and self.kinds[identifier] else -1
+
+    def __contains__(self, name):
+        return self._id(name) >= 0
+
+    # Number of identifiers with occurrences.
+    def __len__(self):
+        return sum(1 for kinds in self.kinds if kinds)
+
+    # Occurrences of name in source order as (line, column, kind name) tuples, only those of the
+    # given kind (DEFINITION, ASSIGNMENT or USE) when kind is not None.
+    def references(self, name, kind=None):
+        identifier = self._id(name)
+        if identifier < 0:
+            return []
+        kinds = self.kinds[identifier]
+        return [(line, column, KIND_NAMES[kinds[i]])
+                for i, (line, column) in enumerate(zip(self.lines[identifier], self.columns[identifier]))
+                if kind is None or kinds[i] == kind]
+
+    # (line, column) of the definition of name, or None when it is never assigned.
+    def definition(self, name):
+        identifier = self._id(name)
+        if identifier < 0 or not self.defined[identifier]:
+            return None
+        position = self.kinds[identifier].index(DEFINITION)
+        return self.lines[identifier][position], self.columns[identifier][position]
+
+    # Sorted line numbers name occurs on, leaving out except_line.
+    def lines_of(self, name, except_line=None):
+        identifier = self._id(name)
+        if identifier < 0:
+            return []
+        return sorted(set(self.lines[identifier]) - {except_line})
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from Interner import Interner
+
+    cross_reference = CrossReference(Interner())
+    tokens = [('VARIABLE', 'x', 1, 1), ('ASSIGN', '=', 1, 3), ('NUMBER', '1', 1, 5),
+              ('VARIABLE', 'y', 2, 1), ('ASSIGN', '=', 2, 3), ('VARIABLE', 'x', 2, 5), ('PLUS', '+', 2, 7),
+              ('NUMBER', '2', 2, 9),
+              ('VARIABLE', 'x', 3, 1), ('ASSIGN', '=', 3, 3), ('VARIABLE', 'y', 3, 5)]
+    for token in tokens:
+        cross_reference.feed(*token)
+    cross_reference.finish()
+    for identifier, name in enumerate(cross_reference.interner.names):
+        print(identifier, name, cross_reference.definition(name), cross_reference.references(identifier))
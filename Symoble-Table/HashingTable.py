@@ -1,44 +1,158 @@
+from array import array
+
+# Marks a deleted slot of an OpenAddressingTable, so probes for words placed after it go on.
+_DELETED = object()
+
+
 # Represents a node in the linked list used for chaining in the hash table.
+# The full hash is kept so resizing and mismatches never rehash or compare the word.
 class HashTableNode:
-    def __init__(self, word):
+    def __init__(self, word, value=None, hashed=None):
         self.word = word
+        self.value = value
+        self.hash = hash(word) if hashed is None else hashed
         self.next = None
 
-# Initializes a hash table with a specified maximum size (default is 7).
-# Uses a list (hash_table) to store linked lists
+
+# Hash table with separate chaining. Words are hashed with Python's hash() (SipHash for
+# strings), so identifiers of the same length and first letter no longer share a bucket, and
+# the bucket is picked from the low bits of the hash. Words may also be Interner ids: an int
+# hashes to itself, so dense ids fill the buckets evenly and compare as integers (id 0
+# included). The bucket count is a power of two and doubles when size / capacity would pass
+# max_load_factor, so chains stay short and insert, lookup and delete cost O(1) on average
+# however many words the table holds.
 class HashTable:
-    def __init__(self, max_size=7):  # Increase max_size to accommodate index 6
-        self.max_size = max_size
-        self.hash_table = [None] * max_size  # List to store linked lists
+    def __init__(self, max_size=8, max_load_factor=0.75):
+        if max_load_factor <= 0:
+            raise ValueError("max_load_factor must be positive")
+        capacity = 8
+        while capacity < max_size:
+            capacity *= 2
+        self.max_size = capacity  # number of buckets
+        self.max_load_factor = max_load_factor
+        self.size = 0
+        self.hash_table = [None] * capacity  # List to store linked lists
 
-    # The Hash Calculation Function
+    # The Hash Calculation Function: the bucket of a word.
     def hash_function(self, word):
-        if not word:
+        if word is None or word == "":
+            raise ValueError("Empty word cannot be hashed")
+        return hash(word) & (self.max_size - 1)
+
+    def _find(self, word):
+        if word is None or word == "":
             raise ValueError("Empty word cannot be hashed")
-        # Hash(var) = (var word len + Ascii of first character) % hash max 
-        return ((len(word) * ord(word[0])) % self.max_size) 
+        hashed = hash(word)
+        current = self.hash_table[hashed & (self.max_size - 1)]
+        while current is not None:
+            if current.hash == hashed and current.word == word:
+                return current
+            current = current.next
+        return None
+
+    # Adds a word, or replaces its value when it is already in the table.
+    def insert(self, word, value=None):
+        if word is None or word == "":
+            raise ValueError("Empty word cannot be hashed")
+        hashed = hash(word)
+        index = hashed & (self.max_size - 1)
+        current = self.hash_table[index]
+        while current is not None:
+            if current.hash == hashed and current.word == word:
+                current.value = value
+                return
+            current = current.next
+
+        # New words go to the front of their chain
+        new_node = HashTableNode(word, value, hashed)
+        new_node.next = self.hash_table[index]
+        self.hash_table[index] = new_node
+        self.size += 1
+        if self.size > self.max_load_factor * self.max_size:
+            self._resize(self.max_size * 2)
 
-    def insert(self, word):
-        hashed_index = self.hash_function(word) # Computes the hash value of the word
-        new_node = HashTableNode(word)
+    # Moves every node to a table of new_size buckets; nodes are relinked, not copied.
+    def _resize(self, new_size):
+        new_table = [None] * new_size
+        mask = new_size - 1
+        for head in self.hash_table:
+            current = head
+            while current is not None:
+                following = current.next
+                index = current.hash & mask
+                current.next = new_table[index]
+                new_table[index] = current
+                current = following
+        self.hash_table = new_table
+        self.max_size = new_size
 
-        # If the bucket is empty, insert the new node
-        if self.hash_table[hashed_index] is None:
-            self.hash_table[hashed_index] = new_node
-            return
+    # The value stored with a word, or default when the word is not in the table.
+    def lookup(self, word, default=None):
+        node = self._find(word)
+        return default if node is None else node.value
 
-        # Insert the new node while maintaining the order
-        current = self.hash_table[hashed_index]
+    def delete(self, word):
+        if word is None or word == "":
+            raise ValueError("Empty word cannot be hashed")
+        hashed = hash(word)
+        index = hashed & (self.max_size - 1)
+        current = self.hash_table[index]
         prev = None
-        while current and (len(current.word) * ord(current.word[0])) <= (len(word) * ord(word[0])):
+        while current is not None:
+            if current.hash == hashed and current.word == word:
+                if prev:
+                    prev.next = current.next
+                else:
+                    self.hash_table[index] = current.next
+                self.size -= 1
+                return
             prev = current
             current = current.next
+        raise ValueError(f"{word!r} is not in the hash table")
 
-        if prev:
-            prev.next = new_node
-        else:
-            self.hash_table[hashed_index] = new_node
-        new_node.next = current
+    def __contains__(self, word):
+        return word is not None and word != "" and self._find(word) is not None
+
+    def __len__(self):
+        return self.size
+
+    # Words in bucket order.
+    def __iter__(self):
+        for head in self.hash_table:
+            current = head
+            while current is not None:
+                yield current.word
+                current = current.next
+
+    def items(self):
+        for head in self.hash_table:
+            current = head
+            while current is not None:
+                yield current.word, current.value
+                current = current.next
+
+    # Collision and chain-length statistics. collisions counts the words that share their bucket
+    # with a word before them; chain_lengths[n] is the number of buckets holding n words.
+    def stats(self):
+        chain_lengths = {}
+        for head in self.hash_table:
+            length = 0
+            current = head
+            while current is not None:
+                length += 1
+                current = current.next
+            chain_lengths[length] = chain_lengths.get(length, 0) + 1
+        used_buckets = self.max_size - chain_lengths.get(0, 0)
+        return {
+            'size': self.size,
+            'buckets': self.max_size,
+            'load_factor': self.size / self.max_size,
+            'used_buckets': used_buckets,
+            'collisions': self.size - used_buckets,
+            'longest_chain': max(chain_lengths),
+            'average_chain': self.size / used_buckets if used_buckets else 0.0,
+            'chain_lengths': dict(sorted(chain_lengths.items())),
+        }
 
     # Prints the contents of the hash table.
     def print_hash_table(self):
@@ -55,11 +169,192 @@ class HashTable:
             else:
                 print(f"Index {i}: -")
 
+
+# Hash table with open addressing: words, their hashes and their values sit in three parallel
+# flat arrays of max_size slots instead of one node object per word, and a lookup probes
+# consecutive slots from hash(word) & (max_size - 1) (linear probing) until it finds the word or
+# an empty slot. Deleting leaves a tombstone (_DELETED) so later words stay reachable; tombstones
+# are reused by inserts and dropped whenever the table is rebuilt. It has the interface of
+# HashTable, and keeps occupied plus deleted slots under max_load_factor of the table.
+class OpenAddressingTable:
+    def __init__(self, max_size=8, max_load_factor=0.6):
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor must be between 0 and 1")
+        capacity = 8
+        while capacity < max_size:
+            capacity *= 2
+        self.max_load_factor = max_load_factor
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.max_size = capacity
+        self.size = 0
+        self.tombstones = 0
+        self.hashes = array('q', bytes(8 * capacity))
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+
+    # The Hash Calculation Function: the first slot probed for a word.
+    def hash_function(self, word):
+        if word is None or word == "":
+            raise ValueError("Empty word cannot be hashed")
+        return hash(word) & (self.max_size - 1)
+
+    # Slot holding word, or -1.
+    def _find(self, word):
+        if word is None or word == "":
+            raise ValueError("Empty word cannot be hashed")
+        hashed = hash(word)
+        mask = self.max_size - 1
+        keys, hashes = self.keys, self.hashes
+        index = hashed & mask
+        while True:
+            key = keys[index]
+            if key is None:
+                return -1
+            if hashes[index] == hashed and key is not _DELETED and key == word:
+                return index
+            index = (index + 1) & mask
+
+    # Adds a word, or replaces its value when it is already in the table.
+    def insert(self, word, value=None):
+        if word is None or word == "":
+            raise ValueError("Empty word cannot be hashed")
+        hashed = hash(word)
+        mask = self.max_size - 1
+        keys, hashes = self.keys, self.hashes
+        index = hashed & mask
+        free = -1  # first tombstone on the probe path
+        while True:
+            key = keys[index]
+            if key is None:
+                break
+            if key is _DELETED:
+                if free < 0:
+                    free = index
+            elif hashes[index] == hashed and key == word:
+                self.values[index] = value
+                return
+            index = (index + 1) & mask
+
+        if free >= 0:
+            index = free
+            self.tombstones -= 1
+        keys[index] = word
+        hashes[index] = hashed
+        self.values[index] = value
+        self.size += 1
+        if self.size + self.tombstones > self.max_load_factor * self.max_size:
+            # double when the words themselves fill the table, otherwise only clear tombstones
+            if self.size > self.max_load_factor * self.max_size / 2:
+                self._resize(self.max_size * 2)
+            else:
+                self._resize(self.max_size)
+
+    # Reinserts every word into new_size empty slots; their stored hashes are reused.
+    def _resize(self, new_size):
+        old_keys, old_hashes, old_values = self.keys, self.hashes, self.values
+        size = self.size
+        self._allocate(new_size)
+        mask = new_size - 1
+        keys, hashes, values = self.keys, self.hashes, self.values
+        for slot, key in enumerate(old_keys):
+            if key is None or key is _DELETED:
+                continue
+            hashed = old_hashes[slot]
+            index = hashed & mask
+            while keys[index] is not None:
+                index = (index + 1) & mask
+            keys[index] = key
+            hashes[index] = hashed
+            values[index] = old_values[slot]
+        self.size = size
+
+    # The value stored with a word, or default when the word is not in the table.
+    def lookup(self, word, default=None):
+        index = self._find(word)
+        return default if index < 0 else self.values[index]
+
+    def delete(self, word):
+        index = self._find(word)
+        if index < 0:
+            raise ValueError(f"{word!r} is not in the hash table")
+        self.keys[index] = _DELETED
+        self.values[index] = None
+        self.size -= 1
+        self.tombstones += 1
+
+    def __contains__(self, word):
+        return word is not None and word != "" and self._find(word) >= 0
+
+    def __len__(self):
+        return self.size
+
+    # Words in slot order.
+    def __iter__(self):
+        for key in self.keys:
+            if key is not None and key is not _DELETED:
+                yield key
+
+    def items(self):
+        for key, value in zip(self.keys, self.values):
+            if key is not None and key is not _DELETED:
+                yield key, value
+
+    # Probe statistics: probe_lengths[n] is the number of words found n slots after their own
+    # (0 when a word sits in its first slot); collisions counts the words not in their first slot.
+    def stats(self):
+        mask = self.max_size - 1
+        probe_lengths = {}
+        for slot, key in enumerate(self.keys):
+            if key is not None and key is not _DELETED:
+                distance = (slot - self.hashes[slot]) & mask
+                probe_lengths[distance] = probe_lengths.get(distance, 0) + 1
+        return {
+            'size': self.size,
+            'buckets': self.max_size,
+            'load_factor': self.size / self.max_size,
+            'tombstones': self.tombstones,
+            'collisions': self.size - probe_lengths.get(0, 0),
+            'longest_probe': max(probe_lengths, default=0),
+            'average_probe': sum(distance * count for distance, count in probe_lengths.items()) / self.size
+            if self.size else 0.0,
+            'probe_lengths': dict(sorted(probe_lengths.items())),
+        }
+
+    # Prints the contents of the hash table.
+    def print_hash_table(self):
+        print("Hash Table:")
+        for i, key in enumerate(self.keys):
+            if key is None:
+                print(f"Index {i}: -")
+            elif key is _DELETED:
+                print(f"Index {i}: (deleted)")
+            else:
+                print(f"Index {i}: {key}")
+
+
+# Symbol table implementations by the name create_table selects them with.
+TABLE_TYPES = {'chaining': HashTable, 'open_addressing': OpenAddressingTable}
+
+
+# A new empty symbol table of the given kind; options go to its constructor.
+def create_table(kind='chaining', **options):
+    if kind not in TABLE_TYPES:
+        raise ValueError(f"Unknown table kind {kind!r}, expected one of {', '.join(TABLE_TYPES)}")
+    return TABLE_TYPES[kind](**options)
+
+
 # Example usage
-# words = ["frog", "tree", "hill", "bird", "cat", "bad"]
-words = ["ali", "mohamed", "khaled", "saad", "olaa", "amir"]
-hash_table = HashTable()
-for word in words:
-    hash_table.insert(word)
+if __name__ == "__main__":
+    # words = ["frog", "tree", "hill", "bird", "cat", "bad"]
+    words = ["ali", "mohamed", "khaled", "saad", "olaa", "amir"]
+    for kind in TABLE_TYPES:
+        hash_table = create_table(kind)
+        for word in words:
+            hash_table.insert(word)
 
-hash_table.print_hash_table()
\ No newline at end of file
+        hash_table.print_hash_table()
+        print("saad" in hash_table, hash_table.lookup("saad"), "omar" in hash_table)
+        hash_table.delete("saad")
+        print(sorted(hash_table), hash_table.stats())
@@ -1,153 +1,155 @@
-import re
-
-TOKEN_TYPES = [
-    ("NUMBER", r"\d+"),
-    ("STRING", r'"[^"]*"'),
-    ("VARIABLE", r"[a-zA-Z_][a-zA-Z0-9_]*"),
-    ("ASSIGN", r"="),
-    ("PLUS", r"\+"),
-    ("MINUS", r"-"),
-    ("MULTIPLY", r"\*"),
-    ("DIVIDE", r"/"),
-    ("LPAREN", r"\("),
-    ("RPAREN", r"\)"),
-    ("WHITESPACE", r"\s+"),
-]
-
-TOKEN_REGEX = [(name, re.compile(pattern)) for name, pattern in TOKEN_TYPES]
-
-def lexer(file_path):
-    tokens = []
-    with open(file_path, 'r') as file:
-        for line_number, line in enumerate(file, 1):
-            line_token = []
-            line = line.strip()
-            while line:
-                match = None
-                for token_name, token_regex in TOKEN_REGEX:
-                    regex_match = token_regex.match(line)
-                    if regex_match:
-                        match = (token_name, regex_match.group(0))
-                        if match[0] != "WHITESPACE":
-                            line_token.append(match)
-                            # line_token.append((match[0], match[1], f"In -> {line_number}"))
-                        line = line[regex_match.end() :]
-                        break
-                if not match:
-                    raise ValueError("Error")
-            tokens.append(line_token)
-    return tokens
+from bisect import bisect_left, insort
+from itertools import islice
+from operator import itemgetter
 
+# Entries per block of an OrderedTable's sorted index; a block splits in two past twice this.
+BLOCK_SIZE = 512
 
+_NAME = itemgetter(0)
+
+
+# Symbol table kept in declaration order (table) with a dict index by name, so lookup costs O(1),
+# and a sorted index: the entries sorted by name in blocks of at most 2 * BLOCK_SIZE, with the last
+# name of every block in maxes. An insert bisects maxes for its block and inserts into that block
+# only, so sorted order is maintained as symbols arrive instead of re-sorting on every report.
+# sort_key, when given, maps a name to what it sorts by: with Interner ids as names,
+# sort_key=interner.name keeps the entries in alphabetical order rather than id order.
 class OrderedTable:
-    def __init__(self):
+    def __init__(self, sort_key=None):
+        self.sort_key = sort_key
+        self._entry_key = _NAME if sort_key is None else (lambda entry: sort_key(entry[0]))
         self.table = []
+        self.index = {}
+        self.blocks = []
+        self.maxes = []
+        self._snapshot_taken = False
+        self._shared = set()  # ids of blocks a snapshot may still be reading
 
     def insert(self, name, datatype, line_declare):
-        self.table.append((name, datatype, line_declare))
+        if name in self.index:
+            raise ValueError(f"{name!r} is already in the table")
+        entry = (name, datatype, line_declare)
+        self.table.append(entry)
+        self.index[name] = entry
+
+        if self._snapshot_taken:
+            # snapshots keep the current lists; copy the directory now and blocks as they change
+            self.blocks = list(self.blocks)
+            self.maxes = list(self.maxes)
+            self._shared = {id(block) for block in self.blocks}
+            self._snapshot_taken = False
+        key = name if self.sort_key is None else self.sort_key(name)
+        if not self.blocks:
+            self.blocks.append([entry])
+            self.maxes.append(key)
+            return
+        i = bisect_left(self.maxes, key)
+        if i == len(self.maxes):  # past the last name: append to the last block
+            i -= 1
+            self.maxes[i] = key
+        block = self.blocks[i]
+        if id(block) in self._shared:
+            self._shared.discard(id(block))
+            block = self.blocks[i] = list(block)
+        insort(block, entry, key=self._entry_key)
+        if len(block) > 2 * BLOCK_SIZE:
+            self.blocks[i:i + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            self.maxes[i:i + 1] = [self._entry_key(block[BLOCK_SIZE - 1]), self._entry_key(block[-1])]
 
     def lookup(self, name):
-        for i in self.table:
-            if i[0] == name:
-                return i[1]  # Return the value associated with the name
-        return None  # Return None if the name is not found
+        entry = self.index.get(name)
+        return None if entry is None else entry[1]  # None if the name is not found
+
+    def __len__(self):
+        return len(self.table)
+
+    # Entries in name order, from the first name >= start when given, produced block by block.
+    # Inserts made while iterating do not disturb it (see snapshot).
+    def sorted_entries(self, start=None):
+        return self.snapshot().entries(start)
 
     def sorted_table(self):
-        return sorted(self.table, key=lambda x: x[0])  # Sort the table alphabetically by variable name
-
-
-
-class Parser:
-    def __init__(self, tokens, table):
-        self.tokens = tokens
-        self.current_token_index = 0
-        self.table = table # parameter refers to the symbol table where variable declarations are stored.
-
-    def parse(self):
-        return self.assignment()
-
-    def assignment(self):
-        variable_name_token = self.consume("VARIABLE")
-        self.consume("ASSIGN")
-        expression_value = self.expression()
-
-        # For Table
-        value = expression_value if isinstance(expression_value, str) else expression_value[2]
-        datatype = "float" if "." in value else "int" if value.replace(".", "").isdigit() else "str"
-        if not self.table.lookup(variable_name_token[1]):
-            self.table.insert(variable_name_token[1], datatype, self.current_line)
-        
-        return ("=", variable_name_token[1], value)
-
-    def factor(self):
-        token_type, token_value = self.consume("NUMBER", "STRING", "VARIABLE", "LPAREN")
-        if token_type == "NUMBER" or token_type == "STRING" or token_type == "VARIABLE":
-            return token_value
-        elif token_type == "LPAREN":
-            expression_value = self.expression()
-            self.consume("RPAREN")
-            return expression_value
-
-    def term(self):
-        result = self.factor()
-        while self.current_token_index < len(self.tokens):
-            if self.tokens[self.current_token_index][0] in {"MULTIPLY", "DIVIDE"}:
-                operator_token = self.consume("MULTIPLY", "DIVIDE")
-                result = (operator_token[1], result, self.factor())
-            else:
-                break
-        return result
-
-    def expression(self):
-        result = self.term()
-        while self.current_token_index < len(self.tokens):
-            if self.tokens[self.current_token_index][0] in {"PLUS", "MINUS"}:
-                operator_token = self.consume("PLUS", "MINUS")
-                result = (operator_token[1], result, self.term())
-            else:
-                break
-        return result
-
-    def consume(self, *expected_token_types):
-        if self.current_token_index >= len(self.tokens):
-            raise ValueError("Unexpected end of input")
-        current_token = self.tokens[self.current_token_index]
-        if current_token[0] not in expected_token_types:
-            raise ValueError(f"Expected one of {expected_token_types}, got {current_token}")
-        self.current_token_index += 1
-        return current_token
-
-
-table = OrderedTable()
-file_path = 'text1.txt'
-tokens = lexer(file_path)
-
-print('Parse Tree : ')
-for line_num, line_tokens in enumerate(tokens, start=1):
-    parser = Parser(line_tokens, table)
-    # print(f"\nParse For Line {line_num} : ")
-    # for token in line_tokens:
-    #     print(token)
-    parser.current_line = line_num  # Track the line number where the variable was declared
-    parse_tree = parser.parse()
-    print(parse_tree)
-
-
-
-file_content = []
-with open(file_path, 'r') as file:
-    main_content = file.readlines()
-    for item in main_content:
-        file_content.append(item.strip())
-
-print("\nSymbol Table : ")
-print("Counter | Variable | Data Type | Line Declare | Line Repeat")
-for count, entry in enumerate(table.sorted_table(), start=1):
-    variable_name = entry[0]
-    datatype = entry[1]
-    line_declare = entry[2]
-    
-    line_repeat = [i + 1 for i, line in enumerate(file_content) if i + 1 != line_declare and line.strip().startswith(variable_name + " = ")]
-    line_repeat_str = ', '.join(map(str, line_repeat)) if line_repeat else []
-    
-    print(f"{count:<7} | {variable_name:<8} | {datatype:<9} | {line_declare:<12} | {line_repeat_str}")
\ No newline at end of file
+        return list(self.sorted_entries())  # The table sorted alphabetically by variable name
+
+    # Read-only view of the table as it is now. Nothing is copied: the view shares the sorted
+    # blocks, and the table copies a block only when it next changes one a view still shares.
+    def snapshot(self):
+        self._snapshot_taken = True
+        return OrderedTableSnapshot(self.blocks, self.maxes, len(self.table), self.sort_key)
+
+
+class OrderedTableSnapshot:
+    def __init__(self, blocks, maxes, size, sort_key=None):
+        self.blocks = blocks
+        self.maxes = maxes
+        self.size = size
+        self.sort_key = sort_key
+        self._entry_key = _NAME if sort_key is None else (lambda entry: sort_key(entry[0]))
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return self.entries()
+
+    def entries(self, start=None):
+        blocks = self.blocks
+        first = 0
+        if start is not None:
+            if self.sort_key is not None:
+                start = self.sort_key(start)
+            first = bisect_left(self.maxes, start)
+            if first == len(blocks):
+                return
+            block = blocks[first]
+            yield from islice(block, bisect_left(block, start, key=self._entry_key), None)
+            first += 1
+        for i in range(first, len(blocks)):
+            yield from blocks[i]
+
+    def lookup(self, name):
+        key = name if self.sort_key is None else self.sort_key(name)
+        i = bisect_left(self.maxes, key)
+        if i == len(self.blocks):
+            return None
+        block = self.blocks[i]
+        entry = block[bisect_left(block, key, key=self._entry_key)]
+        return entry[1] if entry[0] == name else None
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from CrossReference import CrossReference
+    from Interner import Interner
+    from ProgramParser import ProgramParser
+    from TokenStream import TokenStream
+
+    # one Interner for the lexer, the parser, the symbol table and the cross-reference index
+    interner = Interner()
+    table = OrderedTable(sort_key=interner.name)
+    file_path = 'text1.txt'
+    stream = TokenStream.from_file(file_path, interner=interner)
+    cross_reference = CrossReference(interner)
+    cross_reference.feed_stream(stream)
+
+    print('Parse Tree : ')
+    # one ProgramParser over the whole file, declaring the names in the table as it goes
+    for statement in ProgramParser(stream, table).parse():
+        print(statement.tree)
+
+    print("\nSymbol Table : ")
+    print("Counter | Variable | Data Type | Line Declare | Line Repeat")
+    for count, entry in enumerate(table.sorted_table(), start=1):
+        variable_name = interner.name(entry[0])
+        datatype = entry[1]
+        line_declare = entry[2]
+
+        # every other line the variable is assigned or used on, from the cross-reference index
+        line_repeat = cross_reference.lines_of(entry[0], except_line=line_declare)
+        line_repeat_str = ', '.join(map(str, line_repeat)) if line_repeat else []
+
+        print(f"{count:<7} | {variable_name:<8} | {datatype:<9} | {line_declare:<12} | {line_repeat_str}")
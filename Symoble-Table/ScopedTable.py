@@ -0,0 +1,83 @@
+# Symbol table with nested scopes. One dict maps every visible name to its shadow stack: the
+# (depth, value) pairs of its declarations in the open scopes, innermost last, so resolve only
+# reads the top of one stack. Every scope keeps an undo log of the names it declared; exit_scope
+# pops exactly those stacks. Entering and leaving a scope therefore costs O(names declared in it)
+# and resolving costs O(1), however deep the nesting and however many names are visible.
+class ScopedTable:
+    def __init__(self):
+        self.bindings = {}  # name -> [(depth, value), ...]
+        self.scopes = [[]]  # undo log per open scope; scopes[0] is the global scope
+
+    @property
+    def depth(self):
+        return len(self.scopes) - 1
+
+    def enter_scope(self):
+        self.scopes.append([])
+
+    def exit_scope(self):
+        if len(self.scopes) == 1:
+            raise ValueError("Cannot exit the global scope")
+        bindings = self.bindings
+        for name in self.scopes.pop():
+            stack = bindings[name]
+            if len(stack) == 1:
+                del bindings[name]
+            else:
+                stack.pop()
+
+    # Declares name in the innermost scope, shadowing declarations of outer scopes.
+    def declare(self, name, value=None):
+        depth = len(self.scopes) - 1
+        stack = self.bindings.get(name)
+        if stack is None:
+            self.bindings[name] = [(depth, value)]
+        elif stack[-1][0] == depth:
+            raise ValueError(f"{name!r} is already declared in this scope")
+        else:
+            stack.append((depth, value))
+        self.scopes[-1].append(name)
+
+    # Value of the innermost visible declaration of name, or default when none is visible.
+    def resolve(self, name, default=None):
+        stack = self.bindings.get(name)
+        return default if stack is None else stack[-1][1]
+
+    # Depth of the scope the visible declaration of name belongs to, or -1.
+    def scope_of(self, name):
+        stack = self.bindings.get(name)
+        return -1 if stack is None else stack[-1][0]
+
+    # Changes the value of the visible declaration of name.
+    def assign(self, name, value):
+        stack = self.bindings.get(name)
+        if stack is None:
+            raise ValueError(f"{name!r} is not declared")
+        stack[-1] = (stack[-1][0], value)
+
+    # lookup(name) as in HashTable and OrderedTable.
+    lookup = resolve
+
+    def __contains__(self, name):
+        return name in self.bindings
+
+    # Number of visible names.
+    def __len__(self):
+        return len(self.bindings)
+
+    # Visible names and their values.
+    def items(self):
+        for name, stack in self.bindings.items():
+            yield name, stack[-1][1]
+
+
+# Example usage
+if __name__ == "__main__":
+    table = ScopedTable()
+    table.declare("x", "int")
+    table.declare("y", "str")
+    table.enter_scope()
+    table.declare("x", "float")  # shadows the global x
+    print("inner:", table.resolve("x"), table.resolve("y"), "depth", table.depth)
+    table.exit_scope()
+    print("outer:", table.resolve("x"), table.resolve("y"), "depth", table.depth)
@@ -35,7 +35,9 @@ class BinaryTree:
         return self._search_recursive(self.root, key)  # Call recursive search function
 
     def _search_recursive(self, node, key):
-        if node is None or node.key == key:  # If node is None or key is found
+        if node is None:  # If the key is not in the tree
+            return None
+        if node.key == key:  # If key is found
             return node.value  # Return value associated with key
         if key < node.key:  # If key is less than current node's key
             return self._search_recursive(node.left, key)  # Recursive call for left subtree
@@ -51,19 +53,275 @@ class BinaryTree:
             self._inorder_traversal_recursive(node.right)  # Traverse right subtree
 
 
+# Node of an AVLTree. __slots__ keeps it to five references, with no __dict__.
+class AVLNode:
+    __slots__ = ('key', 'value', 'left', 'right', 'height')
+
+    def __init__(self, key, value, left=None, right=None, height=1):
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+        self.height = height  # Levels in the subtree rooted here, 1 for a leaf
+
+
+def _height(node):
+    return node.height if node else 0
+
+
+def _update_height(node):
+    left = node.left.height if node.left else 0
+    right = node.right.height if node.right else 0
+    node.height = (left if left > right else right) + 1
+
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+# Restores the AVL property at node, whose subtrees are balanced and differ in height by at most
+# two, and returns the root of the rebalanced subtree.
+def _rebalance(node):
+    _update_height(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+
+# Self-balancing (AVL) variant of BinaryTree: the heights of the two subtrees of every node differ
+# by at most one, so the tree stays about log2(n) levels deep whatever order the keys arrive in,
+# sorted identifiers from generated code included. Insert, search and delete walk down with a
+# loop and rebalance on the way back up along the recorded path, so nothing recurses.
+class AVLTree:
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    # Tree over keys, which must be sorted in strictly increasing order, with values[i] (None when
+    # values is not given) stored under keys[i]. Built in O(n) by splitting at the middle.
+    @classmethod
+    def from_sorted(cls, keys, values=None):
+        if values is not None and len(values) != len(keys):
+            raise ValueError("keys and values differ in length")
+        for i in range(1, len(keys)):
+            if not keys[i - 1] < keys[i]:
+                raise ValueError(f"Keys are not strictly increasing at position {i}")
+
+        def build(low, high):  # the subtree of keys[low:high]; depth is only log2(n)
+            if low >= high:
+                return None
+            middle = (low + high) // 2
+            left = build(low, middle)
+            right = build(middle + 1, high)
+            node = AVLNode(keys[middle], None if values is None else values[middle], left, right)
+            _update_height(node)
+            return node
+
+        tree = cls()
+        tree.root = build(0, len(keys))
+        tree.size = len(keys)
+        return tree
+
+    # Replaces the child link that pointed at old (the root when parent is None) with new.
+    def _relink(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    # Rebalances the nodes of path from the deepest up, stopping once a subtree keeps its height.
+    def _rebalance_path(self, path):
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            balanced = _rebalance(node)
+            if balanced is not node:
+                self._relink(path[i - 1] if i else None, node, balanced)
+            elif node.height == old_height:
+                break
+
+    def insert(self, key, value):
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:
+                # If the key already exists, update the value
+                node.value = value
+                return
+        new_node = AVLNode(key, value)
+        self.size += 1
+        if not path:
+            self.root = new_node
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance_path(path)
+
+    def _find(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    # The value stored under key, or default when key is not in the tree.
+    def search(self, key, default=None):
+        node = self._find(key)
+        return default if node is None else node.value
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __len__(self):
+        return self.size
+
+    def delete(self, key):
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:
+            raise ValueError(f"{key!r} is not in the tree")
+        self.size -= 1
+
+        if node.left is not None and node.right is not None:
+            # move the in-order successor's entry here and unlink the successor instead
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            node = successor
+        child = node.left if node.left is not None else node.right
+        self._relink(path[-1] if path else None, node, child)
+        # a deletion can shrink every subtree on the path, so walk it all
+        for i in range(len(path) - 1, -1, -1):
+            balanced = _rebalance(path[i])
+            if balanced is not path[i]:
+                self._relink(path[i - 1] if i else None, path[i], balanced)
+
+    # (key, value) pairs in key order with low <= key < high, either bound left out as None.
+    # An explicit stack replaces recursion; it holds one node per level, so O(log n) of them.
+    def items(self, low=None, high=None):
+        stack = []
+        node = self.root
+        while True:
+            while node is not None:
+                if low is not None and node.key < low:
+                    node = node.right  # the whole left subtree is below low as well
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if high is not None and not node.key < high:
+                return
+            yield node.key, node.value
+            node = node.right
+
+    # Keys in order.
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    # (key, value) pairs of the string keys starting with prefix, in key order.
+    def prefix_items(self, prefix):
+        for key, value in self.items(prefix):
+            if not key.startswith(prefix):
+                return
+            yield key, value
+
+    def height(self):
+        return _height(self.root)
+
+    # Checks the ordering, stored heights and AVL balance of every node and returns the height;
+    # raises ValueError on the first violation. Iterative, for use on trees of any size.
+    def check(self):
+        heights = {}
+        stack = [(self.root, False)] if self.root else []
+        previous = None
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                left, right = heights.pop(id(node.left), 0), heights.pop(id(node.right), 0)
+                if abs(left - right) > 1 or node.height != max(left, right) + 1:
+                    raise ValueError(f"Node {node.key!r} is out of balance")
+                heights[id(node)] = node.height
+                continue
+            stack.append((node, True))
+            if node.right:
+                stack.append((node.right, False))
+            if node.left:
+                stack.append((node.left, False))
+        for key in self:
+            if previous is not None and not previous < key:
+                raise ValueError(f"Key {key!r} is out of order")
+            previous = key
+        return _height(self.root)
+
+
 # Example of using the binary tree
-tree = BinaryTree()
-tree.insert(5, "Apple")
-tree.insert(3, "Banana")
-tree.insert(7, "Cherry")
-tree.insert(2, "Date")
-tree.insert(4, "Elderberry")
-tree.insert(6, "Fig")
-tree.insert(8, "Grape")
-
-print("Tree Structure :")
-tree.inorder_traversal()
-
-# Output:
-# Tree Structure:
-# (2: Date) (3: Banana) (4: Elderberry) (5: Apple) (6: Fig) (7: Cherry) (8: Grape)
\ No newline at end of file
+if __name__ == "__main__":
+    tree = BinaryTree()
+    tree.insert(5, "Apple")
+    tree.insert(3, "Banana")
+    tree.insert(7, "Cherry")
+    tree.insert(2, "Date")
+    tree.insert(4, "Elderberry")
+    tree.insert(6, "Fig")
+    tree.insert(8, "Grape")
+
+    print("Tree Structure :")
+    tree.inorder_traversal()
+
+    # Output:
+    # Tree Structure:
+    # (2: Date) (3: Banana) (4: Elderberry) (5: Apple) (6: Fig) (7: Cherry) (8: Grape)
+
+    # Sorted insertion, the worst case for BinaryTree, keeps an AVLTree shallow
+    avl = AVLTree()
+    for key in range(1, 1024):
+        avl.insert(key, str(key))
+    print("\nAVL height after 1023 sorted inserts:", avl.height())
+    print("Keys 10 to 14:", list(avl.items(10, 15)))
+    names = AVLTree.from_sorted(["count", "counter", "index", "input", "total"], [1, 2, 3, 4, 5])
+    print("Names starting with 'in':", list(names.prefix_items("in")))
@@ -0,0 +1,257 @@
+from array import array
+
+from ExpressionEngine import ExpressionEngine
+
+
+# Typed syntax tree nodes. Every node knows its kind by its class, so consumers can dispatch on
+# the node type instead of checking isinstance(tree, str) on nested tuples, and carries the
+# source offsets [start, end) it was parsed from. __slots__ only saves the per-node __dict__: a
+# node with its offset ints still takes more than twice the memory of the nested tuple it
+# replaces (Benchmark/SyntaxTreeBenchmark.py). For compact trees use the Arena below.
+class Node:
+    __slots__ = ('start', 'end')
+
+
+class Num(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value, start, end):
+        self.value = value  # the lexeme, e.g. '3.4'
+        self.start = start
+        self.end = end
+
+
+class Str(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value, start, end):
+        self.value = value  # the lexeme with its quotes, e.g. '"text"'
+        self.start = start
+        self.end = end
+
+
+class Name(Node):
+    __slots__ = ('name', 'symbol')
+
+    def __init__(self, name, start, end, symbol=-1):
+        self.name = name  # the lexeme
+        self.symbol = symbol  # Interner id of the name, -1 when the tokens were not interned
+        self.start = start
+        self.end = end
+
+
+class UnaryOp(Node):
+    __slots__ = ('op', 'operand')
+
+    def __init__(self, op, operand, start, end):
+        self.op = op
+        self.operand = operand
+        self.start = start
+        self.end = end
+
+
+class BinOp(Node):
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right, start, end):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.start = start
+        self.end = end
+
+
+class Assign(Node):
+    __slots__ = ('target', 'value')
+
+    def __init__(self, target, value, start, end):
+        self.target = target  # a Name
+        self.value = value
+        self.start = start
+        self.end = end
+
+
+_LEAF_CLASSES = {'NUMBER': Num, 'STRING': Str, 'IDENTIFIER': Name, 'VARIABLE': Name}
+
+
+# The nested-tuple form ParseTree.Parser produces, built without recursion so deep trees work.
+def to_tuple(node):
+    results = []
+    stack = [(node, False)]
+    while stack:
+        current, children_done = stack.pop()
+        if isinstance(current, (Num, Str)):
+            results.append(current.value)
+        elif isinstance(current, Name):
+            results.append(current.name)
+        elif not children_done:
+            stack.append((current, True))
+            children = {Assign: ('value',), BinOp: ('right', 'left'), UnaryOp: ('operand',)}[type(current)]
+            for child in children:
+                stack.append((getattr(current, child), False))
+        elif isinstance(current, Assign):
+            results.append(('=', current.target.name, results.pop()))
+        elif isinstance(current, UnaryOp):
+            results.append((current.op, results.pop()))
+        else:
+            right = results.pop()
+            results.append((current.op, results.pop(), right))
+    return results[0]
+
+
+# ExpressionEngine that builds Node objects. The tokens must carry offsets, i.e. be TokenStream
+# views (TokenView.start / TokenView.end).
+class NodeBuilder(ExpressionEngine):
+    def leaf(self, token):
+        leaf_class = _LEAF_CLASSES[token.type]
+        if leaf_class is Name:
+            return Name(token.value, token.start, token.end, token.symbol)
+        return leaf_class(token.value, token.start, token.end)
+
+    def binary(self, operator_token, left, right):
+        return BinOp(operator_token.value, left, right, left.start, right.end)
+
+    def unary(self, operator_token, operand):
+        return UnaryOp(operator_token.value, operand, operator_token.start, operand.end)
+
+    def assignment(self, name_token, value):
+        target = Name(name_token.value, name_token.start, name_token.end, name_token.symbol)
+        return Assign(target, value, target.start, value.end)
+
+
+# Arena mode: the whole tree lives in parallel arrays and a node is an integer index into them.
+#   kinds  - node kind (NUM, STR, NAME, UNARY, BINARY, ASSIGN)
+#   ops    - operator code for UNARY/BINARY, an index into self.operators
+#   first  - left child / operand / assignment target, -1 for leaves
+#   second - right child / assigned value, the Interner id of a NAME (-1 when the tokens were
+#            not interned), -1 otherwise
+#   starts, ends - source offsets; a leaf's text is source[start:end]
+# That is 18 bytes per node with no Python object per node, for trees with tens of millions of nodes.
+NUM, STR, NAME, UNARY, BINARY, ASSIGN = range(6)
+_LEAF_KINDS = {'NUMBER': NUM, 'STRING': STR, 'IDENTIFIER': NAME, 'VARIABLE': NAME}
+
+
+class Arena:
+    def __init__(self, source):
+        self.source = source
+        self.kinds = array('B')
+        self.ops = array('B')
+        self.first = array('i')
+        self.second = array('i')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.operators = []
+        self.operator_codes = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind, operator, first, second, start, end):
+        if operator is None:
+            code = 0
+        else:
+            code = self.operator_codes.get(operator)
+            if code is None:
+                code = self.operator_codes[operator] = len(self.operators)
+                self.operators.append(operator)
+        self.kinds.append(kind)
+        self.ops.append(code)
+        self.first.append(first)
+        self.second.append(second)
+        self.starts.append(start)
+        self.ends.append(end)
+        return len(self.kinds) - 1
+
+    # Interner id of a NAME node, -1 for other nodes.
+    def symbol(self, node):
+        return self.second[node] if self.kinds[node] == NAME else -1
+
+    def text(self, node):
+        text = self.source[self.starts[node]:self.ends[node]]
+        return text if isinstance(text, str) else bytes(text).decode()
+
+    # The nested-tuple form of the subtree at node, like to_tuple() for Node objects.
+    def to_tuple(self, node):
+        results = []
+        stack = [(node, False)]
+        kinds, first, second = self.kinds, self.first, self.second
+        while stack:
+            current, children_done = stack.pop()
+            kind = kinds[current]
+            if kind <= NAME:
+                results.append(self.text(current))
+            elif not children_done:
+                stack.append((current, True))
+                if kind != UNARY:
+                    stack.append((second[current], False))
+                if kind != ASSIGN:
+                    stack.append((first[current], False))
+            elif kind == ASSIGN:
+                results.append(('=', self.text(first[current]), results.pop()))
+            elif kind == UNARY:
+                results.append((self.operators[self.ops[current]], results.pop()))
+            else:
+                right = results.pop()
+                results.append((self.operators[self.ops[current]], results.pop(), right))
+        return results[0]
+
+
+# ExpressionEngine that appends nodes to an Arena and returns their indexes.
+class ArenaBuilder(ExpressionEngine):
+    def __init__(self, arena):
+        super().__init__()
+        self.arena = arena
+
+    def leaf(self, token):
+        kind = _LEAF_KINDS[token.type]
+        return self.arena.add(kind, None, -1, token.symbol if kind == NAME else -1, token.start, token.end)
+
+    def binary(self, operator_token, left, right):
+        arena = self.arena
+        return arena.add(BINARY, operator_token.value, left, right, arena.starts[left], arena.ends[right])
+
+    def unary(self, operator_token, operand):
+        arena = self.arena
+        return arena.add(UNARY, operator_token.value, operand, -1, operator_token.start, arena.ends[operand])
+
+    def assignment(self, name_token, value):
+        arena = self.arena
+        target = arena.add(NAME, None, -1, name_token.symbol, name_token.start, name_token.end)
+        return arena.add(ASSIGN, None, target, value, name_token.start, arena.ends[value])
+
+
+# Parses the assignments of a TokenStream with a NodeBuilder or ArenaBuilder and returns the
+# assignment nodes. Each statement is NAME '=' expression, ended like in ProgramParser by ';', a
+# new line or the end of the input; an expression only carries on to the next line inside
+# parentheses.
+def parse_assignments(stream, builder=None):
+    builder = builder or NodeBuilder()
+    statements = []
+    index = 0
+    end = len(stream)
+    while index < end:
+        name_token = stream[index]
+        if name_token.type == 'SEMICOLON':
+            index += 1
+            continue
+        if name_token.type not in ('IDENTIFIER', 'VARIABLE') or index + 1 >= end or stream[index + 1].type != 'ASSIGN':
+            raise ValueError(f"Expected an assignment at line {name_token.line}, got {name_token}")
+        value, index = builder.parse(stream, index + 2, same_line=True)
+        if index < end and stream[index].type != 'SEMICOLON' and stream[index].line == stream[index - 1].line:
+            raise ValueError(f"Expected end of statement at line {stream[index].line}, got {stream[index]}")
+        statements.append(builder.assignment(name_token, value))
+    return statements
+
+
+if __name__ == "__main__":
+    from TokenStream import TokenStream
+
+    stream = TokenStream.from_file("text1.txt")
+    for statement in parse_assignments(stream):
+        print(type(statement.value).__name__, statement.start, statement.end, to_tuple(statement))
+
+    arena = Arena(stream.source)
+    roots = parse_assignments(stream, ArenaBuilder(arena))
+    print(f"\nArena: {len(arena)} nodes")
+    for root in roots:
+        print(arena.to_tuple(root))
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import tempfile
+
+# Generated tables (lexer DFAs, parse tables, ...) are kept as JSON files under this directory,
+# one file per (kind, key). COMPILER_CACHE_DIR moves it somewhere else.
+DEFAULT_CACHE_DIR = os.environ.get(
+    'COMPILER_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'),
+)
+
+
+# Stable hash of any JSON-serializable spec, e.g. a TOKEN_TYPES list plus a generator version.
+def spec_hash(*parts):
+    text = json.dumps(parts, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def cache_path(kind, key, cache_dir=None):
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, f'{kind}-{key}.json')
+
+
+# Returns the stored data, or None when there is no usable entry. A hit touches the file, so
+# modification times order the entries by last use for prune().
+def load(kind, key, cache_dir=None):
+    path = cache_path(kind, key, cache_dir)
+    try:
+        with open(path, 'r') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+# Writes to a temporary file in the same directory and renames it over the entry, so readers
+# never see a half-written file and concurrent writers just replace each other. With
+# max_entries, the least recently used entries of the kind beyond that many are deleted.
+def store(kind, key, data, cache_dir=None, max_entries=None):
+    path = cache_path(kind, key, cache_dir)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump(data, file, separators=(',', ':'))
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    if max_entries is not None:
+        prune(kind, max_entries, cache_dir)
+    return path
+
+
+# Deletes all but the max_entries most recently used entries of a kind.
+def prune(kind, max_entries, cache_dir=None):
+    directory = cache_dir or DEFAULT_CACHE_DIR
+    prefix = kind + '-'
+    entries = []
+    try:
+        for entry in os.scandir(directory):
+            key = entry.name[len(prefix):-len('.json')]
+            if entry.name.startswith(prefix) and entry.name.endswith('.json') and key and '-' not in key:
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+    except OSError:
+        return
+    entries.sort()
+    for _, path in entries[:max(len(entries) - max_entries, 0)]:
+        try:
+            os.unlink(path)
+        except OSError:  # already removed by another process
+            pass
@@ -0,0 +1,225 @@
+import mmap
+from array import array
+from bisect import bisect_left
+
+from TokensAndLexem import TOKEN_TYPES, master_regex
+
+
+# Tokens stored column by column instead of as one tuple per token:
+#   types  - uint8 index into self.names
+#   starts - int32 offset of the first character of the token in self.source
+#   ends   - int32 offset just past the token
+#   lines  - int32 1-based line number
+#   symbols - int32 Interner id of an identifier token, -1 for other tokens; only kept when the
+#             stream is lexed with an interner, None otherwise
+# A token costs 13 bytes this way (17 with symbols). The lexeme is sliced out of the source only
+# when it is read.
+# A slice of a stream is another TokenStream over the same columns (only first/stop differ),
+# so slicing never copies.
+class TokenStream:
+    def __init__(self, source, names, types=None, starts=None, ends=None, lines=None, first=0, stop=None,
+                 symbols=None):
+        self.source = source  # str, bytes or mmap the offsets point into
+        self.names = names  # token type names, indexed by type code
+        self.types = array('B') if types is None else types
+        self.starts = array('i') if starts is None else starts
+        self.ends = array('i') if ends is None else ends
+        self.lines = array('i') if lines is None else lines
+        self.symbols = symbols
+        self.first = first
+        self.stop = len(self.types) if stop is None else stop
+
+    # Lexes a whole text in one pass. Whitespace (newlines included) is skipped and never
+    # stored; line numbers are kept by counting the newlines inside it. With an Interner, the
+    # IDENTIFIER and VARIABLE tokens are interned as they are lexed and their ids kept in symbols.
+    @classmethod
+    def from_text(cls, text, token_types=TOKEN_TYPES, interner=None):
+        names = [name for name, _ in token_types]
+        if len(names) > 256:
+            raise ValueError("At most 256 token types fit in a uint8 type code")
+        regex = master_regex(token_types)
+        group_to_code = [None] * (regex.groups + 1)
+        for name, index in regex.groupindex.items():
+            group_to_code[index] = names.index(name)
+        whitespace = names.index('WHITESPACE') if 'WHITESPACE' in names else -1
+        identifiers = {code for code, name in enumerate(names) if name in ('IDENTIFIER', 'VARIABLE')}
+
+        stream = cls(text, names, symbols=None if interner is None else array('i'))
+        symbols_append = None if interner is None else stream.symbols.append
+        intern = None if interner is None else interner.intern
+        types_append = stream.types.append
+        starts_append = stream.starts.append
+        ends_append = stream.ends.append
+        lines_append = stream.lines.append
+        match = regex.match
+        line_number = 1
+        position = 0
+        end = len(text)
+        while position < end:
+            regex_match = match(text, position)
+            if regex_match is None:
+                line_end = text.find('\n', position)
+                raise ValueError(f'Invalid token at line {line_number}: '
+                                 f'{text[position:line_end if line_end != -1 else len(text)]}')
+            code = group_to_code[regex_match.lastindex]
+            token_end = regex_match.end()
+            if code == whitespace:
+                line_number += text.count('\n', position, token_end)
+            else:
+                types_append(code)
+                starts_append(position)
+                ends_append(token_end)
+                lines_append(line_number)
+                if symbols_append is not None:
+                    symbols_append(intern(text[position:token_end]) if code in identifiers else -1)
+            position = token_end
+        stream.stop = len(stream.types)
+        return stream
+
+    @classmethod
+    def from_file(cls, file_path, token_types=TOKEN_TYPES, interner=None):
+        with open(file_path, 'r') as file:
+            return cls.from_text(file.read(), token_types, interner)
+
+    # Closes the source when it is a memory map (ParallelLexer's streams). Slices share the
+    # source, so they can no longer be read either.
+    def close(self):
+        if isinstance(self.source, mmap.mmap):
+            self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.stop - self.first
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            first, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("TokenStream slices must be contiguous")
+            return TokenStream(self.source, self.names, self.types, self.starts, self.ends, self.lines,
+                               self.first + first, self.first + max(first, stop), self.symbols)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return TokenView(self, self.first + index)
+
+    def __iter__(self):
+        for index in range(self.first, self.stop):
+            yield TokenView(self, index)
+
+    def type_name(self, index):
+        return self.names[self.types[self.first + index]]
+
+    def lexeme(self, index):
+        index += self.first
+        text = self.source[self.starts[index]:self.ends[index]]
+        return text if isinstance(text, str) else bytes(text).decode()
+
+    # Splits the stream into one slice per source line, like the list of lists lexer() returns.
+    # Lines without tokens give empty slices. Line numbers are sorted, so each boundary is a bisect.
+    def line_slices(self):
+        if not len(self):
+            return []
+        lines = self.lines
+        last_line = lines[self.stop - 1]
+        slices = []
+        position = self.first
+        for line_number in range(lines[self.first], last_line + 1):
+            next_position = bisect_left(lines, line_number + 1, position, self.stop)
+            slices.append(TokenStream(self.source, self.names, self.types, self.starts, self.ends,
+                                      self.lines, position, next_position, self.symbols))
+            position = next_position
+        return slices
+
+
+# One token of a TokenStream, read lazily from the columns. It indexes and unpacks like the
+# (type, lexeme) pairs the Parser classes already work with:
+#     token_type, token_value = token
+#     token[0] == "NUMBER"
+# It prints like the lexer's (type, lexeme, "Line : n") tuples, but is equal only to views of the
+# same token; compare tuple(token) to compare with a pair.
+class TokenView:
+    __slots__ = ('stream', 'index')
+
+    def __init__(self, stream, index):
+        self.stream = stream
+        self.index = index  # absolute index into the stream columns
+
+    @property
+    def type(self):
+        return self.stream.names[self.stream.types[self.index]]
+
+    @property
+    def type_code(self):
+        return self.stream.types[self.index]
+
+    @property
+    def value(self):
+        stream = self.stream
+        text = stream.source[stream.starts[self.index]:stream.ends[self.index]]
+        return text if isinstance(text, str) else bytes(text).decode()
+
+    @property
+    def start(self):
+        return self.stream.starts[self.index]
+
+    @property
+    def end(self):
+        return self.stream.ends[self.index]
+
+    @property
+    def line(self):
+        return self.stream.lines[self.index]
+
+    # 1-based column, counted back from the token to the newline before it.
+    @property
+    def column(self):
+        stream = self.stream
+        start = stream.starts[self.index]
+        return start - stream.source.rfind('\n' if isinstance(stream.source, str) else b'\n', 0, start)
+
+    # Interner id of an identifier token, -1 for other tokens or a stream lexed without interner.
+    @property
+    def symbol(self):
+        symbols = self.stream.symbols
+        return -1 if symbols is None else symbols[self.index]
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, position):
+        if position == 0 or position == -2:
+            return self.type
+        if position == 1 or position == -1:
+            return self.value
+        raise IndexError("token index out of range")
+
+    def __iter__(self):
+        yield self.type
+        yield self.value
+
+    def __eq__(self, other):
+        if isinstance(other, TokenView):
+            return self.stream is other.stream and self.index == other.index
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self.stream), self.index))
+
+    def __repr__(self):
+        return f"({self.type!r}, {self.value!r}, 'Line : {self.line}')"
+
+
+if __name__ == "__main__":
+    stream = TokenStream.from_file("text.txt")
+    for line_number, line_tokens in enumerate(stream.line_slices(), 1):
+        print(f"\nTokens For Line {line_number} Are :")
+        for token in line_tokens:
+            print(token)
+    print("\n- Number of Tokens:", len(stream))
@@ -1,3 +1,5 @@
+import codecs
+import os
 import re
 
 # Define token types
@@ -13,7 +15,8 @@ TOKEN_TYPES = [
     ('IDENTIFIER', r'[a-zA-Z_][a-zA-Z0-9_]*'), # Matches identifiers (variable names)
     ('STRING', r'\".*?\"'),           # Matches string literals enclosed in double quotes
     ('WHITESPACE', r'\s+'),           # Matches whitespace
-    ('UNKNOWN', r'.'),                # Matches any other character
+    ('UNKNOWN', r'[^;\n]'),           # Matches any other character but the separator
+    ('SEMICOLON', r';'),              # Matches statement separator (last, so earlier ids are unchanged)
 ]
 
 # Compile regular expressions for token types 
@@ -23,28 +26,86 @@ TOKEN_TYPES = [
 TOKEN_REGEXES = [(name, re.compile(pattern)) for name, pattern in TOKEN_TYPES] # array of tuples
 #  is a list of tuples where each tuple contains a token type name and its corresponding regular expression pattern.
 
+# All token types joined into one alternation with a named group per type.
+# Python tries the alternatives left to right, so the first type in TOKEN_TYPES that matches wins,
+# exactly like looping over TOKEN_REGEXES, but in a single regex call per token.
+def master_regex(token_types):
+    return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_types))
+
+MASTER_REGEX = master_regex(TOKEN_TYPES)
+
+# Tokenizes one stripped line. Instead of cutting the matched text off the front of the line
+# (which copies the rest of the line for every token) it keeps an offset and matches from there.
+# With an Interner, tokens get a fourth and last element, (type, lexeme, "Line : n", id): the
+# Interner id of an IDENTIFIER, -1 for other tokens. The identifier's lexeme is then its shared copy
+# (interner.names[id]), so all the occurrences of a name are one string object.
+def tokenize_line(line, line_number, interner=None):
+    line_tokens = []
+    match = MASTER_REGEX.match
+    position = 0
+    end = len(line)
+    while position < end:
+        regex_match = match(line, position)
+        if regex_match is None:
+            raise ValueError(f'Invalid token at line {line_number}: {line[position:]}')
+        token_name = regex_match.lastgroup  # name of the alternative that matched
+        if token_name != "WHITESPACE":
+            if interner is None:
+                line_tokens.append((token_name, regex_match.group(), f"Line : {line_number}"))
+            elif token_name == 'IDENTIFIER':
+                symbol = interner.intern(regex_match.group())
+                line_tokens.append((token_name, interner.names[symbol], f"Line : {line_number}", symbol))
+            else:
+                line_tokens.append((token_name, regex_match.group(), f"Line : {line_number}", -1))
+        position = regex_match.end()
+    return line_tokens
+
 # function takes a file path as input, reads the content of the file, and tokenizes it. It iterates through each line of the file and tokenizes it line by line.
-def lexer(file_path):
+def lexer(file_path, interner=None):
     tokens = []
     with open(file_path, 'r') as file:
         for line_number, line in enumerate(file, 1):  # For Every Line
-            line_tokens = []
-            line = line.strip()  # Remove leading and trailing whitespace
-            while line: #  iterates over the line until it is empty.
-                match = None
-                for token_name, token_regex in TOKEN_REGEXES:
-                    regex_match = token_regex.match(line)
-                    if regex_match:
-                        match = (token_name, regex_match.group(0))  #  If a match is found, it assigns a tuple to match containing the token name (token_name) and the matched string 
-                        if token_name != "WHITESPACE":
-                            line_tokens.append((match[0], match[1], f"Line : {line_number}"))
-                        line = line[regex_match.end():]
-                        break
-                if not match:
-                    raise ValueError(f'Invalid token at line {line_number}: {line}')
-            tokens.append(line_tokens)
+            tokens.append(tokenize_line(line.strip(), line_number, interner))  # Remove leading and trailing whitespace
     return tokens
 
+# Size of the pieces read from a file when streaming.
+CHUNK_SIZE = 1 << 16
+
+# Turns a path, a file object (text or binary) or an iterable of chunks into an iterable of
+# chunks. A read stops on an empty result of either type, '' or b''.
+def _read_chunks(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r') as file:
+            while chunk := file.read(CHUNK_SIZE):
+                yield chunk
+    elif hasattr(source, 'read'):
+        while chunk := source.read(CHUNK_SIZE):
+            yield chunk
+    else:
+        yield from source
+
+# Generator version of lexer(): yields the same tokens one at a time, as a flat stream.
+# Only the current line is kept in memory. Chunks are cut at arbitrary points, so the
+# text after the last newline of a chunk is carried over and joined with the next chunk;
+# a token (or string literal) split across two chunks is therefore lexed as a whole.
+def iter_tokens(source, interner=None):
+    line_number = 0
+    pending = ''  # unfinished line from the previous chunk
+    decoder = codecs.getincrementaldecoder('utf-8')()  # bytes chunks may split a character
+    for chunk in _read_chunks(source):
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        lines = chunk.split('\n')
+        lines[0] = pending + lines[0]
+        pending = lines.pop()
+        for line in lines:
+            line_number += 1
+            yield from tokenize_line(line.strip(), line_number, interner)
+    # flush the decoder: a multi-byte character cut off at the end raises UnicodeDecodeError
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield from tokenize_line(pending.strip(), line_number + 1, interner)
+
 # Test the lexer
 if __name__ == "__main__":
     file_path = "text.txt"